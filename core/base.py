@@ -1,15 +1,130 @@
+import asyncio
+import contextlib
+import json
+import re
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Iterable, List, Optional, Tuple
 
+from core import llm_cache
+from core.http_client import close_shared_http_client, get_shared_http_client, get_shared_openai_client
+from utils import settings
 from utils.paths import ExperimentPathManager
+from utils.ratelimit import ratelimited
+from utils.retry import retry_api_call
+
+# asyncio primitives bind to the loop they first wait on, and `create()` starts a new loop per call,
+# so the request semaphore is kept per event loop.
+_REQUEST_SEMAPHORES = weakref.WeakKeyDictionary()
+
+# AsyncOpenAI clients are cached per event loop too, as their pooled connections belong to the loop that opened them
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+# Any line starting with ``` (optionally indented), including its line break
+_FENCE_RE = re.compile(r"(?m)^[ \t]*```.*\n?")
+
+# Event loop of the innermost `shared_event_loop()` block of each thread
+_SHARED_LOOP = threading.local()
+
+
+def request_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore capping the number of in-flight LLM requests on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _REQUEST_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _REQUEST_SEMAPHORES[loop] = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS)
+    return semaphore
+
+
+async def _close_loop_clients() -> None:
+    """Close the HTTP clients bound to the running event loop."""
+    # The OpenAI client holds no connections of its own, closing the shared HTTP client releases them
+    _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    await close_shared_http_client()
+    if settings.USE_RAW_TRANSPORT:
+        from core import raw_transport
+        await raw_transport.close_session()
+
+
+@contextlib.contextmanager
+def shared_event_loop():
+    """
+    Run all `run_async` calls of the block on a single event loop, so the clients and pooled connections opened by
+    one call are reused by the next, and close them once when the block exits.
+    Nested blocks reuse the loop of the outer one.
+    """
+    if getattr(_SHARED_LOOP, "loop", None) is not None:
+        yield
+        return
+
+    loop = asyncio.new_event_loop()
+    _SHARED_LOOP.loop = loop
+    try:
+        yield
+    finally:
+        _SHARED_LOOP.loop = None
+        try:
+            loop.run_until_complete(_close_loop_clients())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            loop.close()
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the loop of the enclosing `shared_event_loop()` block, or else on a new event loop,
+    closing the loop's HTTP clients before the loop goes away.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        The result of the coroutine
+    """
+    loop = getattr(_SHARED_LOOP, "loop", None)
+    if loop is not None:
+        return loop.run_until_complete(coro)
+
+    async def _run():
+        try:
+            return await coro
+        finally:
+            await _close_loop_clients()
+
+    return asyncio.run(_run())
+
+
+def run_batch(generators: Iterable["BaseGenerator"]) -> List[Any]:
+    """
+    Run many generators concurrently on a single event loop.
+
+    Args:
+        generators: Generators exposing an async `acreate()`
+
+    Returns:
+        The saved output paths, in the order of the given generators
+    """
+    async def _gather():
+        return await asyncio.gather(*[generator.acreate() for generator in generators])
+
+    return run_async(_gather())
 
 
 class BaseGenerator(ABC):
-    client = None
-    model_name: str = None
+    # Generators are created per conversation, so instances carry no __dict__
+    __slots__ = ("path_manager", "model_name")
+    default_model_name: str = None
 
-    def __init__(self, experiment_path_manager: ExperimentPathManager):
+    def __init__(self, experiment_path_manager: ExperimentPathManager, model_name: Optional[str] = None):
+        """
+        Args:
+            experiment_path_manager: Path manager of the experiment and conversation to work on
+            model_name: Model to use, overriding the class default (itself configurable through settings)
+        """
         self.path_manager = experiment_path_manager
+        self.model_name = model_name or self.default_model_name
 
     @abstractmethod
     def generate(self) -> str:
@@ -26,10 +141,188 @@ class BaseGenerator(ABC):
     def create(self):
         return self.save(self.generate())
 
+    @property
+    def client(self):
+        """The synchronous OpenAI client, shared by all generators of the process."""
+        return get_shared_openai_client()
+
+    async def acreate(self):
+        """
+        Async counterpart of `create()` for generators whose `generate()` is a coroutine.
+        The output is saved in a worker thread, so disk writes do not stall other in-flight requests.
+        """
+        output = await self.generate()
+        return await asyncio.to_thread(self.save, output)
+
+    @classmethod
+    def _get_client(cls):
+        """
+        Get the async OpenAI client of the running event loop, creating it on first use.
+        Creating it lazily keeps imports free of client setup, so they work without an API key.
+        Retries are handled by `retry_api_call`, so the client's own retries are disabled.
+        All clients send their requests through the shared HTTP/2 client of the loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = _ASYNC_CLIENTS[loop] = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                max_retries=0,
+                http_client=get_shared_http_client()
+            )
+        return client
+
+    @retry_api_call
+    async def _create_response(self, **request):
+        """
+        Issue a Responses API call on the async client.
+        The call is bounded by the request semaphore, waits for rate limit capacity, and transient failures are
+        retried with exponential backoff.
+        """
+        async with request_semaphore():
+            if settings.USE_RAW_TRANSPORT:
+                from core import raw_transport
+                return await ratelimited(raw_transport.responses_create)(**request)
+            raw_response = await ratelimited(self._get_client().responses.with_raw_response.create)(**request)
+        return raw_response.parse()
+
+    async def _generate_text(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the model output for a single user prompt.
+        Identical (model, prompt, schema) requests are served from the LLM cache without hitting the API.
+
+        Args:
+            prompt: The user prompt
+            schema: Structured output schema passed as the `text` parameter, if any
+
+        Returns:
+            The output text of the model
+        """
+        key = llm_cache.cache_key(self.model_name, prompt, schema)
+        cache_root = self.path_manager.cache_root()
+        output_text = await asyncio.to_thread(llm_cache.load, cache_root, key)
+        if output_text is not None:
+            return output_text
+
+        output_text = await self._fetch_output_text(self.build_request_body(prompt, schema))
+
+        await asyncio.to_thread(llm_cache.store, cache_root, key, output_text)
+        return output_text
+
+    async def arespond(self, **request) -> Tuple[str, Optional[str]]:
+        """
+        Send a Responses API request built by the caller, serving identical requests from the LLM cache as
+        `_generate_text` does.
+        Requests chained to a previous response depend on the conversation state held by the API, so they are
+        always sent.
+
+        Args:
+            request: Responses API request body
+
+        Returns:
+            Tuple of (output_text, response_id), where response_id is None for outputs served from the cache,
+            as those cannot be chained to
+        """
+        chained = "previous_response_id" in request
+        if not chained:
+            # The instructions and input identify the request along with the model and the output format
+            prompt = json.dumps({k: v for k, v in request.items() if k not in ("model", "text")}, sort_keys=True)
+            key = llm_cache.cache_key(request["model"], prompt, request.get("text"))
+            cache_root = self.path_manager.cache_root()
+            output_text = await asyncio.to_thread(llm_cache.load, cache_root, key)
+            if output_text is not None:
+                return output_text, None
+
+        response = await self._create_response(**request)
+
+        if not chained:
+            await asyncio.to_thread(llm_cache.store, cache_root, key, response.output_text)
+        return response.output_text, response.id
+
+    async def _fetch_output_text(self, request: Dict[str, Any]) -> str:
+        """Send a request to the API and return its output text. Subclasses may override how it is fetched."""
+        response = await self._create_response(**request)
+        return response.output_text
+
+    def prepare_request(self) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Load the inputs of the generator and build its request.
+
+        Returns:
+            Tuple of (prompt, schema), where schema is None for free-text outputs
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not build LLM requests")
+
+    def parse_output(self, output_text: str) -> Any:
+        """Convert the raw model output into the value passed to `save()`."""
+        return output_text
+
+    def build_request_body(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build the body of a Responses API request for a single user prompt.
+
+        Args:
+            prompt: The user prompt
+            schema: Structured output schema passed as the `text` parameter, if any
+
+        Returns:
+            Request body, usable both as `responses.create` kwargs and in a batch file
+        """
+        body = {
+            "model": self.model_name,
+            "input": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+        }
+        if schema is not None:
+            body["text"] = schema
+        return body
+
+    def build_batch_request(self, custom_id: str) -> Dict[str, Any]:
+        """
+        Build the Batch API request line for this generator.
+
+        Args:
+            custom_id: Identifier used to route the batch output back to this generator
+
+        Returns:
+            Request line of the batch input JSONL file
+        """
+        prompt, schema = self.prepare_request()
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": self.build_request_body(prompt, schema),
+        }
+
     @staticmethod
-    def strip_markdown_code_block(md_string):
-        lines = md_string.splitlines()
-        # Filter out any line that starts with ```
-        filtered = [line for line in lines if not line.strip().startswith("```")]
-        return "\n".join(filtered)
+    def _format_path(path: Tuple) -> str:
+        """
+        Format path segments as a JSON path, e.g. ("accounts", 0, "balance") -> "accounts[0].balance".
+        
+        Args:
+            path: Dictionary keys and list indices from the root
+            
+        Returns:
+            The formatted path
+        """
+        parts = []
+        for segment in path:
+            if isinstance(segment, int):
+                parts.append(f"[{segment}]")
+            else:
+                parts.append(f".{segment}" if parts else segment)
+        return "".join(parts)
 
+    @staticmethod
+    def strip_markdown_code_block(md_string):
+        # Most structured outputs come unfenced, and a substring check is cheaper than a regex scan
+        if "```" not in md_string:
+            return md_string
+        # Remove every line that starts with ```
+        return _FENCE_RE.sub("", md_string)
@@ -0,0 +1,158 @@
+"""
+Batch Runner module.
+Submits the requests of many generators as a single OpenAI Batch API job and dispatches the results back.
+"""
+
+import json
+import time
+from typing import Dict, Any, List, Sequence
+
+from core import llm_cache
+from core.base import BaseGenerator
+from core.http_client import get_shared_openai_client
+from utils import settings
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchRunner:
+    """
+    Runs generators through the OpenAI Batch API.
+    Batches are billed at half the price of synchronous requests and do not compete for the real-time
+    rate limits, at the cost of a completion window of up to 24 hours.
+    """
+    completion_window = "24h"
+
+    def __init__(self, poll_interval: float = settings.BATCH_POLL_INTERVAL):
+        """
+        Initialize the batch runner.
+
+        Args:
+            poll_interval: Seconds to wait between batch status checks
+        """
+        self.poll_interval = poll_interval
+        # LLM cache keys of the submitted requests, by custom ID
+        self._cache_keys: Dict[str, str] = {}
+
+    @property
+    def client(self):
+        """The synchronous OpenAI client, shared with the generators."""
+        return get_shared_openai_client()
+
+    def run(self, generators: Sequence[BaseGenerator]) -> List[str]:
+        """
+        Submit the generators as one batch, wait for it to finish and save the results.
+
+        Args:
+            generators: Generators implementing `prepare_request()`
+
+        Returns:
+            Paths of the saved outputs, for the requests that succeeded
+        """
+        batch_id = self.submit(generators)
+        batch = self.wait(batch_id)
+        return self.collect(batch, generators)
+
+    def submit(self, generators: Sequence[BaseGenerator]) -> str:
+        """
+        Upload the batch input file and create the batch.
+
+        Args:
+            generators: Generators implementing `prepare_request()`
+
+        Returns:
+            ID of the created batch
+        """
+        lines = []
+        for i, generator in enumerate(generators):
+            request = generator.build_batch_request(self._custom_id(i))
+            body = request["body"]
+            self._cache_keys[request["custom_id"]] = llm_cache.cache_key(
+                body["model"], body["input"][0]["content"], body.get("text")
+            )
+            lines.append(json.dumps(request))
+        batch_file = self.client.files.create(
+            file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/responses",
+            completion_window=self.completion_window
+        )
+        print(f"Submitted batch {batch.id} with {len(lines)} requests")
+        return batch.id
+
+    def wait(self, batch_id: str):
+        """
+        Poll a batch until it reaches a terminal status.
+
+        Args:
+            batch_id: ID of the batch
+
+        Returns:
+            The finished batch object
+
+        Raises:
+            RuntimeError: If the batch did not complete
+        """
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in TERMINAL_STATUSES:
+                break
+            time.sleep(self.poll_interval)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} finished with status '{batch.status}'")
+        return batch
+
+    def collect(self, batch, generators: Sequence[BaseGenerator]) -> List[str]:
+        """
+        Download the batch output and save each result through its generator.
+
+        Args:
+            batch: The completed batch object
+            generators: The generators the batch was submitted for, in submission order
+
+        Returns:
+            Paths of the saved outputs, for the requests that succeeded
+        """
+        generators_by_id = {self._custom_id(i): generator for i, generator in enumerate(generators)}
+        output = self.client.files.content(batch.output_file_id).text if batch.output_file_id else ""
+
+        saved_paths = []
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            generator = generators_by_id[result["custom_id"]]
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                print(f"Batch request {result['custom_id']} failed: {result.get('error') or response.get('body')}")
+                continue
+
+            output_text = self._output_text(response["body"])
+            # Make the batch results available to later synchronous runs of the same prompts
+            cache_key = self._cache_keys.get(result["custom_id"])
+            if cache_key is not None:
+                llm_cache.store(generator.path_manager.cache_root(), cache_key, output_text)
+            saved_paths.append(generator.save(generator.parse_output(output_text)))
+
+        if batch.error_file_id:
+            print(f"Some requests of batch {batch.id} failed, see file {batch.error_file_id}")
+        return saved_paths
+
+    @staticmethod
+    def _custom_id(index: int) -> str:
+        return f"request-{index}"
+
+    @staticmethod
+    def _output_text(body: Dict[str, Any]) -> str:
+        """Concatenate the output text of a raw Responses API body (the SDK's `output_text` property)."""
+        return "".join(
+            content["text"]
+            for item in body.get("output", [])
+            if item.get("type") == "message"
+            for content in item.get("content", [])
+            if content.get("type") == "output_text"
+        )
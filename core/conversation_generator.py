@@ -3,14 +3,45 @@ Conversation Generator module.
 Takes a ground truth JSON and generates a natural free-form conversation.
 """
 
-import json
-import copy
+import asyncio
+import re
+from collections import defaultdict
 from typing import Dict, Any, List, Tuple
 
-from openai import OpenAI
+import orjson
 
 from utils import settings, MISSING_FIELD
-from core.base import BaseGenerator
+from core.base import BaseGenerator, run_async
+
+# List indices in a formatted path, e.g. the 0 and 3 of "accounts[0].holders[3]"
+_INDEX_RE = re.compile(r"\[(\d+)\]")
+
+# Only the ground truth and the missing fields vary between prompts
+_PROMPT_TEMPLATE = (
+    "You are a virtual assistant that simulates realistic financial onboarding Fact Find conversations "
+    "between a financial advisor and a single client. Your task is to generate "
+    "a long natural conversation based on the provided ground truth data.\n\n"
+    "Ground Truth Data:\n{gt}\n\n"
+    "Please note the following:\n"
+    "The following fields are missing and should NOT be mentioned in the conversation:\n{mf}\n\n"
+    "Guidelines:\n"
+    "- Create a natural, realistic dialogue between a financial advisor and a client\n"
+    "- Include casual conversation elements and small talk to make it realistic\n"
+    "- The conversation should focus on gathering financial information for onboarding\n"
+    "- Please make sure to include all the information from the ground truth data\n"
+    "- Please include other data that is not present in the ground truth data, "
+    " making noise in the conversation with respect to the ground truth\n"
+    "- Format the conversation clearly with 'Advisor:' and 'Client:' prefixes\n"
+    "- Include typical clarifications, follow-up questions, and corrections\n"
+    "Make some small bits of the conversation less straightforward by "
+    "using tricks such as:\n"
+    "   -  having some of the details inferred through reasoning\n"
+    "   -  having some of the details suggested by the advisor and confirmed or denied by the client\n"
+    "   - having some of the details stated wrong and corrected subsequently\n"
+    "Do not include any explanations or notes outside the conversation format. "
+    "Please make sure that all the information from the Ground Truth data can be found in the conversation.\n\n"
+    "Generate the conversation now:"
+)
 
 
 class ConversationGenerator(BaseGenerator):
@@ -19,43 +50,54 @@ class ConversationGenerator(BaseGenerator):
     This class creates realistic financial onboarding conversations based on
     the provided ground truth data, considering fields marked as missing.
     """
-    model_name = "gpt-4.5-preview"
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    __slots__ = ()
+    default_model_name = settings.CONVERSATION_MODEL
 
-    def generate(self) -> str:
+    async def generate(self) -> str:
         """
         Generate a natural conversation based on ground truth data.
         Returns:
             Generated conversation text
         """
-        # Load the ground truth data
-        ground_truth_path = self.path_manager.get_ground_truth_path()
-        with open(ground_truth_path, 'r', encoding='utf-8') as f:
-            ground_truth = json.load(f)
+        # Load the ground truth data and build the prompt
+        prompt, _ = await asyncio.to_thread(self.prepare_request)
+        
+        # Generate the conversation using the LLM (or reuse the cached one for an identical prompt)
+        conversation_text = await self._generate_text(prompt)
         
-        # Process ground truth to identify missing fields
-        processed_ground_truth, missing_fields = self.process_ground_truth(ground_truth)
+        return conversation_text
+
+    def prepare_request(self) -> Tuple[str, None]:
+        """
+        Load the ground truth data and build the conversation generation prompt.
+        Returns:
+            Tuple of (prompt, None), as conversations are free text
+        """
+        # Load the ground truth data, with the missing fields removed
+        processed_ground_truth, _, missing_fields_str = self.load_ground_truth()
         # Build the prompt for conversation generation
         prompt = self.get_prompt(
             ground_truth=processed_ground_truth,
-            missing_fields=missing_fields
-        )
-        
-        # Generate the conversation using the LLM
-        response = self.client.responses.create(
-            model=self.model_name,
-            input=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+            missing_fields_str=missing_fields_str
         )
         
-        # Extract the conversation text from the response
-        conversation_text = response.output_text
+        return prompt, None
+
+    def load_ground_truth(self) -> Tuple[Dict[str, Any], List[str], str]:
+        """
+        Parse the ground truth file and separate out its missing fields.
+        The C parser builds the tree, so the missing-field walk is the only Python pass over it, and it is
+        skipped altogether when the file contains no MISSING_FIELD marker.
         
-        return conversation_text
+        Returns:
+            Tuple of (processed_ground_truth, missing_fields, missing_fields_str), as `process_ground_truth`
+        """
+        ground_truth_text = self.path_manager.load_text(self.path_manager.get_ground_truth_path())
+        ground_truth = orjson.loads(ground_truth_text)
+        # The marker needs no JSON escaping, so a marker value always appears verbatim in the file
+        if MISSING_FIELD not in ground_truth_text:
+            return ground_truth, [], self._format_missing_fields([])
+        return self.process_ground_truth(ground_truth)
 
     def save(self, conversation_text: str) -> str:
         """
@@ -69,119 +111,143 @@ class ConversationGenerator(BaseGenerator):
         """
         return self.path_manager.save_conversation(conversation_text)
 
-    def process_ground_truth(self, ground_truth: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    def process_ground_truth(self, ground_truth: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str], str]:
         """
         Process the ground truth to extract information about missing fields.
+        The input is left untouched: the filtered ground truth is built in a single iterative pass.
         
         Args:
             ground_truth: The ground truth data with MISSING_FIELD markers
             
         Returns:
-            Tuple of (processed_ground_truth, missing_fields)
+            Tuple of (processed_ground_truth, missing_fields, missing_fields_str), where missing_fields lists
+            every missing path and missing_fields_str is the condensed, prompt-ready bullet list
         """
-        # Create a deep copy to avoid modifying the original
-        processed_gt = copy.deepcopy(ground_truth)
+        processed_gt = {}
+        missing_fields = []
         
-        # Find all missing fields
-        missing_fields = self._find_missing_fields(processed_gt)
+        # Entries are (target container, key, value, path segments). Children are pushed in reverse so that
+        # they are popped, and appended to their new container, in document order.
+        stack = [(processed_gt, key, value, (key,)) for key, value in reversed(list(ground_truth.items()))]
+        while stack:
+            target, key, value, path = stack.pop()
+            if isinstance(value, dict):
+                container = {}
+                children = value.items()
+            elif isinstance(value, list):
+                container = []
+                children = enumerate(value)
+            elif value == MISSING_FIELD:
+                missing_fields.append(self._format_path(path))
+                continue
+            else:
+                container = value
+                children = None
+            
+            if isinstance(target, list):
+                target.append(container)
+            else:
+                target[key] = container
+            
+            if children is not None:
+                stack.extend(
+                    (container, child_key, child, path + (child_key,))
+                    for child_key, child in reversed(list(children))
+                )
         
-        return processed_gt, missing_fields
+        missing_fields_str = self._format_missing_fields(self._collapse_missing_fields(missing_fields))
+        return processed_gt, missing_fields, missing_fields_str
     
-    def _find_missing_fields(self, data, path="", missing_fields=None):
+    @staticmethod
+    def _collapse_missing_fields(missing_fields: List[str], min_group_size: int = 3) -> List[str]:
         """
-        Recursively process the ground truth data to find missing fields.
+        Merge missing paths that differ in a single list index, e.g. "accounts[0].balance",
+        "accounts[2].balance" and "accounts[5].balance" become "accounts[0, 2, 5].balance".
         
         Args:
-            data: The ground truth data to process
-            path: Current JSON path
-            missing_fields: List to store paths to missing fields
+            missing_fields: List of paths to missing fields
+            min_group_size: Minimum number of paths to merge
             
         Returns:
-            List of paths to missing fields
+            Condensed list of paths, in order of first occurrence
         """
-        if missing_fields is None:
-            missing_fields = []
-            
-        if isinstance(data, dict):
-            # Track keys to delete to avoid modifying the dictionary during iteration
-            keys_to_delete = []
-            for key, value in data.items():
-                current_path = f"{path}.{key}" if path else key
-                if isinstance(value, (dict, list)):
-                    self._find_missing_fields(value, current_path, missing_fields)
-                elif value == MISSING_FIELD:
-                    missing_fields.append(current_path)
-                    keys_to_delete.append(key)
-            
-            # Delete the keys after iteration is complete
-            for key in keys_to_delete:
-                del data[key]
-                
-        elif isinstance(data, list):
-            # Process the list in reverse to avoid index shifting issues when deleting
-            # First identify indices to remove
-            indices_to_delete = []
-            
-            # First pass: identify and process
-            for i, item in enumerate(data):
-                current_path = f"{path}[{i}]"
-                if isinstance(item, (dict, list)):
-                    self._find_missing_fields(item, current_path, missing_fields)
-                elif item == MISSING_FIELD:
-                    missing_fields.append(current_path)
-                    indices_to_delete.append(i)
+        groups = defaultdict(list)
+        for field in missing_fields:
+            groups[_INDEX_RE.sub("[*]", field)].append(field)
+        
+        collapsed = []
+        for pattern, fields in groups.items():
+            if len(fields) >= min_group_size:
+                indices = [_INDEX_RE.findall(field) for field in fields]
+                varying = [i for i in range(len(indices[0])) if len({index[i] for index in indices}) > 1]
+                # Only merge when exactly one index varies, so the merged path stays exact
+                if len(varying) == 1:
+                    merged_indices = list(indices[0])
+                    merged_indices[varying[0]] = ", ".join(index[varying[0]] for index in indices)
+                    parts = pattern.split("[*]")
+                    collapsed.append(parts[0] + "".join(
+                        f"[{index}]{part}" for index, part in zip(merged_indices, parts[1:])
+                    ))
+                    continue
+            collapsed.extend(fields)
+        return collapsed
+    
+    @staticmethod
+    def _format_missing_fields(missing_fields: List[str]) -> str:
+        """
+        Format missing field paths as a bullet list for the prompt.
+        The list is cut at MAX_MISSING_FIELDS_IN_PROMPT entries to bound the prompt size.
+        
+        Args:
+            missing_fields: List of paths to missing fields
             
-            # Second pass: delete in reverse order to avoid index shifting
-            for index in sorted(indices_to_delete, reverse=True):
-                del data[index]
-
-        return missing_fields
-
+        Returns:
+            One "- path" line per field, or "- None" if there are none
+        """
+        if not missing_fields:
+            return "- None"
+        
+        limit = settings.MAX_MISSING_FIELDS_IN_PROMPT
+        lines = [f"- {field}" for field in missing_fields[:limit]]
+        if len(missing_fields) > limit:
+            lines.append(f"- ... and {len(missing_fields) - limit} more omitted")
+        return "\n".join(lines)
+    
     def get_prompt(
         self, 
         ground_truth: Dict[str, Any],
-        missing_fields: List[str]
+        missing_fields_str: str
     ) -> str:
         """
         Build a prompt for conversation generation.
         
         Args:
             ground_truth: The processed ground truth data (with None for missing fields)
-            missing_fields: List of paths to fields that are missing or need to be inferred
+            missing_fields_str: Preformatted bullet list of paths to fields that are missing
             
         Returns:
             Prompt for the LLM
         """
-        # Format the ground truth and missing fields for the prompt
-        ground_truth_str = json.dumps(ground_truth, indent=2)
-        missing_fields_str = "\n- ".join(missing_fields) if missing_fields else "None"
-        
-        return (
-            "You are a virtual assistant that simulates realistic financial onboarding Fact Find conversations "
-            "between a financial advisor and a single client. Your task is to generate "
-            "a long natural conversation based on the provided ground truth data.\n\n"
-            f"Ground Truth Data:\n{ground_truth_str}\n\n"
-            "Please note the following:\n"
-            f"The following fields are missing and should NOT be mentioned in the conversation:\n- {missing_fields_str}\n\n"
-            "Guidelines:\n"
-            "- Create a natural, realistic dialogue between a financial advisor and a client\n"
-            "- Include casual conversation elements and small talk to make it realistic\n"
-            "- The conversation should focus on gathering financial information for onboarding\n"
-            "- Please make sure to include all the information from the ground truth data\n"
-            "- Please include other data that is not present in the ground truth data, "
-            " making noise in the conversation with respect to the ground truth\n"
-            
-            "- Format the conversation clearly with 'Advisor:' and 'Client:' prefixes\n"
-            "- Include typical clarifications, follow-up questions, and corrections\n"
-            "Make some small bits of the conversation less straightforward by "
-            "using tricks such as:\n"
-            "   -  having some of the details inferred through reasoning\n"
-            "   -  having some of the details suggested by the advisor and confirmed or denied by the client\n"
-            "   - having some of the details stated wrong and corrected subsequently\n"
-            "Do not include any explanations or notes outside the conversation format. "
-            "Please make sure that all the information from the Ground Truth data can be found in the conversation.\n\n"
-            "Generate the conversation now:"
-        )
+        # Compact JSON: indentation only adds input tokens, so it is kept for debugging runs
+        option = orjson.OPT_INDENT_2 if settings.DEBUG_PROMPTS else 0
+        ground_truth_str = orjson.dumps(ground_truth, option=option).decode()
+        
+        prompt = _PROMPT_TEMPLATE.format(gt=ground_truth_str, mf=missing_fields_str)
+        if settings.DEBUG_PROMPTS:
+            print(f"Conversation prompt: {self._count_tokens(prompt)} tokens")
+        return prompt
+    
+    def _count_tokens(self, text: str) -> int:
+        """Count the tokens of a text with tiktoken if installed, otherwise estimate them at ~4 characters per token."""
+        try:
+            import tiktoken
+        except ImportError:
+            return len(text) // 4 + 1
+        try:
+            encoding = tiktoken.encoding_for_model(self.model_name)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return len(encoding.encode(text))
         
     def create(self) -> str:
         """
@@ -190,5 +256,4 @@ class ConversationGenerator(BaseGenerator):
         Returns:
             Path to the saved conversation file
         """
-        conversation_text = self.generate()
-        return self.save(conversation_text)
+        return run_async(self.acreate())
@@ -3,13 +3,73 @@ Data Extractor module.
 Takes in conversation transcripts and extracts structured data in JSON format.
 """
 
-import json
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Tuple
 
-from openai import OpenAI
+import fastjsonschema
+import orjson
+from openai import BadRequestError
 
 from utils import settings, MISSING_FIELD
-from core.base import BaseGenerator
+from utils.ratelimit import estimate_tokens, rate_limiter, ratelimited
+from utils.retry import retry_api_call
+from core.base import BaseGenerator, request_semaphore, run_async
+
+# Only the conversation transcript varies between prompts
+_PROMPT_TEMPLATE = (
+    "You are a data extraction expert. Your task is to extract structured data from "
+    "a financial onboarding conversation transcript according to a provided schema. "
+    "Only include information that is explicitly mentioned or can be confidently inferred "
+    f"from the conversation. If information is missing or unclear, mark the field with {MISSING_FIELD}.\n\n"
+    "Here is the conversation transcript:\n\n{txt}\n\n"
+    "Please extract all relevant information from this conversation and format it "
+    "according to the provided JSON schema. "
+    "Do not include currency signs, just provide the numbers as a string. "
+    "Output only the valid JSON data without any "
+    "additional explanations."
+)
+
+
+class _JsonDepthTracker:
+    """
+    Tracks the nesting depth of a JSON document streamed in chunks, so it can tell when the top-level value is
+    closed without parsing the output received so far.
+    """
+    __slots__ = ("depth", "in_string", "escaped")
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Advance over the next chunk of the output.
+        
+        Args:
+            chunk: Text appended to the output
+
+        Returns:
+            True if the top-level value was closed in this chunk
+        """
+        closed = False
+        for char in chunk:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{" or char == "[":
+                self.depth += 1
+            elif char == "}" or char == "]":
+                self.depth -= 1
+                if self.depth == 0:
+                    closed = True
+        return closed
 
 
 class DataExtractor(BaseGenerator):
@@ -18,42 +78,117 @@ class DataExtractor(BaseGenerator):
     This class is responsible for processing conversation transcripts and
     extracting structured data according to a specified schema format.
     """
-    model_name = "gpt-4o-mini"
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    __slots__ = ()
+    default_model_name = settings.EXTRACTION_MODEL
 
-    def generate(self) -> Dict[str, Any]:
+    async def generate(self) -> Dict[str, Any]:
         """
         Extract structured data from a conversation transcript.
         Returns:
             Extracted structured data as a dictionary
         """
+        # Load the schema and conversation, and build the prompt
+        prompt, schema = await asyncio.to_thread(self.prepare_request)
+        
+        # Generate the structured data using the LLM (or reuse the cached output for an identical prompt)
+        output_text = await self._generate_text(prompt, schema)
+        
+        return self.parse_output(output_text)
+
+    def prepare_request(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Load the schema and the conversation transcript, and build the extraction prompt.
+        Returns:
+            Tuple of (prompt, schema)
+        """
         # Get the schema for validation
         schema = self.path_manager.load_schema()
         
         # Load the conversation text
         conversation_path = self.path_manager.get_generated_conversation_path()
-        with open(conversation_path, 'r', encoding='utf-8') as f:
-            conversation_text = f.read()
+        conversation_text = self.path_manager.load_text(conversation_path)
         
-        # Build the prompt for data extraction
-        prompt = self.get_prompt(conversation_text)
+        return self.get_prompt(conversation_text), schema
+
+    def parse_output(self, output_text: str) -> Dict[str, Any]:
+        """
+        Extract the JSON content from the model output.
         
-        # Generate the structured data using the LLM
-        response = self.client.responses.create(
-            model=self.model_name,
-            text=schema,
-            input=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
+        Args:
+            output_text: Raw model output
+
+        Returns:
+            Extracted structured data as a dictionary
+        """
+        extracted_data = orjson.loads(self.strip_markdown_code_block(output_text))
+        try:
+            self.path_manager.get_compiled_validator()(extracted_data)
+        except fastjsonschema.JsonSchemaException as e:
+            # Keep the data anyway, the evaluation accounts for the wrong fields
+            print(f"Extracted data does not match the schema: {e}")
+        return extracted_data
+
+    async def _fetch_output_text(self, request: Dict[str, Any]) -> str:
+        """
+        Stream the extraction, falling back to a regular request if streaming is rejected for the model
+        or the raw transport is in use.
         
-        # Extract the JSON content from the response
-        extracted_data = json.loads(self.strip_markdown_code_block(response.output_text))
+        Args:
+            request: Responses API request body
+
+        Returns:
+            The output text of the model
+        """
+        # The raw transport does not stream; it is meant for bulk runs where throughput matters more
+        if settings.USE_RAW_TRANSPORT:
+            return await super()._fetch_output_text(request)
+        try:
+            return await self._stream_output_text(request)
+        except BadRequestError:
+            # The rejected request consumed no tokens, so give them back before they are reserved again
+            rate_limiter.refund(estimate_tokens(request))
+            return await super()._fetch_output_text(request)
+
+    @retry_api_call
+    async def _stream_output_text(self, request: Dict[str, Any]) -> str:
+        """
+        Stream the extraction, and stop reading as soon as the output parses as a complete JSON document.
+        The stream is requested through the raw response, so the rate limits are updated from its headers.
         
-        return extracted_data
+        Args:
+            request: Responses API request body
+
+        Returns:
+            The output text of the model
+        """
+        async with request_semaphore():
+            raw_response = await ratelimited(self._get_client().responses.with_raw_response.create)(
+                **request, stream=True
+            )
+            stream = raw_response.parse()
+            try:
+                chunks = []
+                tracker = _JsonDepthTracker()
+                async for event in stream:
+                    if event.type != "response.output_text.delta":
+                        continue
+                    chunks.append(event.delta)
+                    # Only parse the output once its top-level value is closed
+                    if tracker.feed(event.delta):
+                        output_text = "".join(chunks)
+                        if self._is_complete_json(output_text):
+                            return output_text
+                return "".join(chunks)
+            finally:
+                await stream.close()
+
+    def _is_complete_json(self, output_text: str) -> bool:
+        """Check whether the (possibly fenced) model output is already a complete JSON document."""
+        try:
+            orjson.loads(self.strip_markdown_code_block(output_text))
+        except orjson.JSONDecodeError:
+            return False
+        return True
 
     def save(self, extracted_data: Dict[str, Any]) -> str:
         """
@@ -77,18 +212,7 @@ class DataExtractor(BaseGenerator):
         Returns:
             Prompt for the LLM
         """
-        return (
-            "You are a data extraction expert. Your task is to extract structured data from "
-            "a financial onboarding conversation transcript according to a provided schema. "
-            "Only include information that is explicitly mentioned or can be confidently inferred "
-            f"from the conversation. If information is missing or unclear, mark the field with {MISSING_FIELD}.\n\n"
-            f"Here is the conversation transcript:\n\n{conversation_text}\n\n"
-            "Please extract all relevant information from this conversation and format it "
-            "according to the provided JSON schema. "
-            "Do not include currency signs, just provide the numbers as a string. "
-            "Output only the valid JSON data without any "
-            "additional explanations."
-        )
+        return _PROMPT_TEMPLATE.format(txt=conversation_text)
         
     def create(self) -> str:
         """
@@ -97,5 +221,4 @@ class DataExtractor(BaseGenerator):
         Returns:
             Path to the saved extracted data file
         """
-        extracted_data = self.generate()
-        return self.save(extracted_data)
\ No newline at end of file
+        return run_async(self.acreate())
\ No newline at end of file
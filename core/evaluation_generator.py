@@ -3,15 +3,109 @@ Evaluator module.
 Compares extracted data with ground truth and calculates accuracy metrics.
 """
 
-import json
-import copy
+import asyncio
+import functools
 import os
-from typing import Dict, Any, List, Union
+import statistics
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 
-from openai import OpenAI
+import orjson
+from rapidfuzz.fuzz import ratio
 
-from core.base import BaseGenerator
+from core import llm_cache
+from core.base import BaseGenerator, run_async
 from utils import MISSING_FIELD, settings
+from utils.paths import JSON_READ_ERRORS, ExperimentPathManager
+
+# Number of evaluation files read in parallel by the aggregator
+AGGREGATION_WORKERS = 16
+
+# Marks a field absent from the extracted data, as None is a valid extracted value
+_ABSENT = object()
+
+# (true positive, false positive, false negative) increments of a field result,
+# by (category, match, whether the field is missing from the extracted data)
+_NO_DELTA = (0, 0, 0)
+_METRIC_DELTAS = {
+    # Correctly extracted field
+    ("present", True, False): (1, 0, 0),
+    # Extracted but incorrect value
+    ("present", False, False): (0, 1, 0),
+    # Field not extracted but should have been
+    ("present", True, True): (0, 0, 1),
+    ("present", False, True): (0, 0, 1),
+    # Extracted field that doesn't exist in ground truth
+    ("extra", True, False): (0, 1, 0),
+    ("extra", False, False): (0, 1, 0),
+    ("extra", True, True): (0, 1, 0),
+    ("extra", False, True): (0, 1, 0),
+}
+
+# Semantic match verdicts by (model, value, value), shared by the evaluations of all conversations of the process
+SEMANTIC_MATCH_MEMO_SIZE = 4096
+_SEMANTIC_MATCHES: Dict[Tuple[str, str, str], bool] = {}
+
+# Semantic match request, sent once for a whole batch of numbered value pairs
+_SEMANTIC_MATCH_PROMPT = """Compare each of the following pairs of values and determine if the two values convey \
+the same, or very similar, client information in a financial context.
+A pair is a match only if both values convey the same, or very similar, client information (ignoring formatting, \
+spelling variations, and minor wording differences), and not a match if they have different meanings.
+Give one verdict per pair, identified by its number i.
+
+Pairs:
+{pairs}"""
+
+_SEMANTIC_MATCH_SCHEMA = {
+    "format": {
+        "type": "json_schema",
+        "name": "semantic_matches",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "matches": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "i": {"type": "integer"},
+                            "match": {"type": "boolean"}
+                        },
+                        "required": ["i", "match"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["matches"],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _read_metrics(file_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Load the metrics of an evaluation file, caching them.
+    The file is streamed, so only the leading "metrics" object is parsed, and the field results are never read.
+    The modification time is part of the cache key, so rewritten files are parsed again.
+    The returned data is shared between callers and must not be modified.
+    
+    Args:
+        file_path: Path to the evaluation file
+        mtime_ns: Modification time of the file, in nanoseconds
+        
+    Returns:
+        The evaluation metrics, or an empty dictionary if there are none
+    """
+    metrics = ExperimentPathManager.iter_json_key(file_path, 'metrics')
+    try:
+        return next(metrics, {})
+    finally:
+        # Close the file without parsing the rest of it
+        metrics.close()
 
 
 class Evaluator(BaseGenerator):
@@ -20,10 +114,10 @@ class Evaluator(BaseGenerator):
     This class compares the extracted data from conversations with the ground truth
     and calculates various accuracy metrics.
     """
-    model_name = "gpt-4o-mini"
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    __slots__ = ()
+    default_model_name = "gpt-4o-mini"
 
-    def generate(self) -> Dict[str, Any]:
+    async def generate(self) -> Dict[str, Any]:
         """
         Generate evaluation metrics by comparing extracted data with ground truth.
         
@@ -31,30 +125,38 @@ class Evaluator(BaseGenerator):
             Evaluation metrics as a dictionary
         """
         # Load the ground truth and extracted data
-        ground_truth_path = self.path_manager.get_ground_truth_path()
-        extracted_path = self.path_manager.get_extracted_data_path()
+        ground_truth, extracted = await asyncio.to_thread(self._load_data)
         
-        with open(ground_truth_path, 'r', encoding='utf-8') as f:
-            ground_truth = json.load(f)
-            
-        with open(extracted_path, 'r', encoding='utf-8') as f:
-            extracted = json.load(f)
-        
-        # Process ground truth to identify missing fields
+        # Flatten the ground truth and identify missing fields
         # We need to find fields that were marked as MISSING_FIELD
         # and remove them from consideration in our evaluation
-        missing_fields = []
-        processed_ground_truth = self._find_missing_fields(ground_truth, missing_fields=missing_fields)
+        flat_ground_truth, missing_fields = self._flatten_and_mark(ground_truth)
         
         # Calculate metrics
-        evaluation = self._evaluate_data(
-            ground_truth=processed_ground_truth,
+        evaluation = await self._evaluate_data(
+            flat_ground_truth=flat_ground_truth,
             extracted=extracted,
             missing_fields=missing_fields
         )
         
         return evaluation
 
+    def _load_data(self):
+        """
+        Load the ground truth and the extracted data of the current conversation.
+        
+        Returns:
+            Tuple of (ground_truth, extracted)
+        """
+        ground_truth_path = self.path_manager.get_ground_truth_path()
+        extracted_path = self.path_manager.get_extracted_data_path()
+        
+        # Read through the path manager, as the files may still be waiting for the artifact writer
+        ground_truth = orjson.loads(self.path_manager.load_bytes(ground_truth_path))
+        extracted = orjson.loads(self.path_manager.load_bytes(extracted_path))
+        
+        return ground_truth, extracted
+
     def save(self, evaluation: Dict[str, Any]) -> str:
         """
         Save evaluation results for a conversation.
@@ -73,64 +175,119 @@ class Evaluator(BaseGenerator):
         """
         raise NotImplementedError("This evaluator doesn't use prompts")
 
-    def _find_missing_fields(self, data, path="", missing_fields=None):
+    def _flatten_and_mark(self, data: Dict[str, Any], sep: str = '.') -> Tuple[Dict[str, Any], List[str]]:
         """
-        Recursively find fields marked as MISSING_FIELD in the data.
+        Flatten the ground truth and collect its MISSING_FIELD markers in a single traversal.
+        The input is left untouched. Flat keys are those of the data with the markers removed, so list indices
+        skip removed items, while missing field paths keep the indices of the original data.
         
         Args:
-            data: The data structure to process
-            path: Current path in the data structure
-            missing_fields: List to collect paths to missing fields
+            data: The ground truth data with MISSING_FIELD markers
+            sep: Separator for keys in the flattened dictionary
             
         Returns:
-            Modified data with MISSING_FIELD markers removed
+            Tuple of (flat_data, missing_fields)
+        """
+        missing_fields = []
+        flat = dict(self._walk(data, sep=sep, missing_fields=missing_fields))
+        return flat, missing_fields
+    
+    def _walk(
+        self,
+        data: Dict[str, Any],
+        parent_key: str = '',
+        sep: str = '.',
+        missing_fields: Optional[List[str]] = None
+    ) -> Iterator[Tuple[str, Any]]:
         """
-        # Make a deep copy to avoid modifying the original
-        if missing_fields is None:
-            missing_fields = []
-            data = copy.deepcopy(data)
+        Iterate over the leaves of a nested dictionary as (flat key, value) pairs, in document order.
+        Lists are expanded into their dictionary items, nested lists are kept as values.
+        The input is never mutated.
         
+        Args:
+            data: The dictionary to walk
+            parent_key: The parent key for nested values
+            sep: Separator for keys in the flattened dictionary
+            missing_fields: If given, MISSING_FIELD markers are skipped and their original paths collected here,
+                and list indices in the flat keys skip the removed items
+            
+        Yields:
+            Tuples of (flat key, value)
+        """
+        marking = missing_fields is not None
+        # Entries are (flat key, original path, value, is_list_item). The original path is a tuple of keys and
+        # indices, only tracked when marking and only formatted for missing fields.
+        # Children are pushed in reverse so that they are popped in document order.
+        stack = [(parent_key, (), data, False)]
+        while stack:
+            key, path, value, is_list_item = stack.pop()
+            if isinstance(value, dict):
+                stack.extend(
+                    (f"{key}{sep}{k}" if key else k, path + (k,) if marking else None, v, False)
+                    for k, v in reversed(list(value.items()))
+                )
+            elif isinstance(value, list) and not is_list_item:
+                children = []
+                index = 0
+                for i, item in enumerate(value):
+                    children.append((f"{key}[{index}]", path + (i,) if marking else None, item, True))
+                    # Markers are removed from lists, shifting the flat index of the following items
+                    if not marking or isinstance(item, (dict, list)) or item != MISSING_FIELD:
+                        index += 1
+                stack.extend(reversed(children))
+            elif marking and value == MISSING_FIELD:
+                missing_fields.append(self._format_path(path))
+            elif marking and isinstance(value, list):
+                yield key, self._strip_missing(value, path, missing_fields)
+            else:
+                yield key, value
+    
+    def _strip_missing(self, data: Any, path: Tuple, missing_fields: List[str]) -> Any:
+        """
+        Copy a nested value without its MISSING_FIELD markers, recording their paths.
+        
+        Args:
+            data: The value to copy
+            path: Dictionary keys and list indices of the value from the root
+            missing_fields: List to collect paths to missing fields
+            
+        Returns:
+            The value with MISSING_FIELD markers removed
+        """
         if isinstance(data, dict):
-            keys_to_delete = []
+            stripped = {}
             for key, value in data.items():
-                current_path = f"{path}.{key}" if path else key
                 if isinstance(value, (dict, list)):
-                    data[key] = self._find_missing_fields(value, current_path, missing_fields)
+                    stripped[key] = self._strip_missing(value, path + (key,), missing_fields)
                 elif value == MISSING_FIELD:
-                    missing_fields.append(current_path)
-                    keys_to_delete.append(key)
-            
-            # Remove MISSING_FIELD entries
-            for key in keys_to_delete:
-                del data[key]
-                
-        elif isinstance(data, list):
-            indices_to_delete = []
-            for i, item in enumerate(data):
-                current_path = f"{path}[{i}]"
-                if isinstance(item, (dict, list)):
-                    data[i] = self._find_missing_fields(item, current_path, missing_fields)
-                elif item == MISSING_FIELD:
-                    missing_fields.append(current_path)
-                    indices_to_delete.append(i)
-            
-            # Remove MISSING_FIELD entries (in reverse to avoid index shifting)
-            for index in sorted(indices_to_delete, reverse=True):
-                del data[index]
-                
-        return data
+                    missing_fields.append(self._format_path(path + (key,)))
+                else:
+                    stripped[key] = value
+            return stripped
         
-    def _evaluate_data(
+        stripped = []
+        for i, item in enumerate(data):
+            if isinstance(item, (dict, list)):
+                stripped.append(self._strip_missing(item, path + (i,), missing_fields))
+            elif item == MISSING_FIELD:
+                missing_fields.append(self._format_path(path + (i,)))
+            else:
+                stripped.append(item)
+        return stripped
+        
+    async def _evaluate_data(
         self, 
-        ground_truth: Dict[str, Any],
+        flat_ground_truth: Dict[str, Any],
         extracted: Dict[str, Any],
         missing_fields: List[str] = None
     ) -> Dict[str, Any]:
         """
         Compare extracted data with ground truth and calculate metrics.
+        Values that do not match exactly are collected first, and their semantic matches are then
+        resolved concurrently.
         
         Args:
-            ground_truth: Ground truth data with MISSING_FIELD values removed
+            flat_ground_truth: Flattened ground truth data with MISSING_FIELD values removed
             extracted: Extracted data
             missing_fields: List of fields that were marked as missing in the ground truth
             
@@ -140,26 +297,28 @@ class Evaluator(BaseGenerator):
         # Set default empty list if None
         missing_fields = missing_fields or []
         
-        # Flatten both dictionaries for comparison
-        flat_ground_truth = self._flatten_dict(ground_truth)
+        # Flatten the extracted data for comparison
         flat_extracted = self._flatten_dict(extracted)
         
         # Collect field-level results
         field_results = {}
+        # Fields whose match awaits a semantic comparison
+        pending_fields = []
         
         # Calculate field-level metrics
         for field, truth_value in flat_ground_truth.items():
-            # Check if field exists in extracted data
-            if field in flat_extracted:
-                extracted_value = flat_extracted[field]
-                
+            # Check if field exists in extracted data, with a single lookup
+            extracted_value = flat_extracted.get(field, _ABSENT)
+            if extracted_value is not _ABSENT:
                 # Compare values
-                is_match = self._compare_values(truth_value, extracted_value)
+                comparison = self._compare_values(truth_value, extracted_value)
+                if comparison == "pending":
+                    pending_fields.append(field)
                 
                 field_results[field] = {
                     "ground_truth": truth_value,
                     "extracted": extracted_value,
-                    "match": is_match,
+                    "match": comparison == "exact",
                     "category": "present"
                 }
             else:
@@ -173,25 +332,29 @@ class Evaluator(BaseGenerator):
                 }
         
         # Check for extra fields in extracted data
-        for field in flat_extracted:
-            if field not in flat_ground_truth:
-                # If the field is marked as MISSING_INFORMATION in the extracted data,
-                # it likely was removed from ground truth during processing, so it's not really an error
-                if flat_extracted[field] == MISSING_FIELD:
-                    field_results[field] = {
-                        "ground_truth": MISSING_FIELD,  # Set ground truth to MISSING_FIELD for consistency
-                        "extracted": flat_extracted[field],
-                        "match": True,  # This is a correct extraction of a missing field
-                        "category": "missing"
-                    }
-                else:
-                    field_results[field] = {
-                        "ground_truth": None,
-                        "extracted": flat_extracted[field],
-                        "match": False,
-                        "category": "extra",
-                        "error": "extra_field"
-                    }
+        for field, extracted_value in flat_extracted.items():
+            if field in flat_ground_truth:
+                continue
+            # If the field is marked as MISSING_INFORMATION in the extracted data,
+            # it likely was removed from ground truth during processing, so it's not really an error
+            if extracted_value == MISSING_FIELD:
+                field_results[field] = {
+                    "ground_truth": MISSING_FIELD,  # Set ground truth to MISSING_FIELD for consistency
+                    "extracted": extracted_value,
+                    "match": True,  # This is a correct extraction of a missing field
+                    "category": "missing"
+                }
+            else:
+                field_results[field] = {
+                    "ground_truth": None,
+                    "extracted": extracted_value,
+                    "match": False,
+                    "category": "extra",
+                    "error": "extra_field"
+                }
+        
+        # Fill in the semantic matches
+        await self._resolve_semantic_matches(field_results, pending_fields)
         
         # Calculate summary metrics
         metrics = self._calculate_metrics(field_results, missing_fields)
@@ -217,95 +380,204 @@ class Evaluator(BaseGenerator):
         Returns:
             Flattened dictionary
         """
-        items = []
-        for k, v in d.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        return dict(self._walk(d, parent_key, sep))
+
+    async def _resolve_semantic_matches(self, field_results: Dict[str, Dict[str, Any]], fields: List[str]) -> None:
+        """
+        Semantically match the values of the given fields, and record the verdicts in the field results.
+        Each distinct pair of values is only matched once, and all unresolved pairs are sent together.
+        
+        Args:
+            field_results: Field-level evaluation results
+            fields: Fields whose values did not match exactly
+        """
+        field_pairs = {
+            field: self._value_pair(field_results[field]["ground_truth"], field_results[field]["extracted"])
+            for field in fields
+        }
+        matches = await self._semantic_matches(list(dict.fromkeys(field_pairs.values())))
+        for field, pair in field_pairs.items():
+            field_results[field]["match"] = matches[pair]
+
+    def _value_pair(self, value1: Any, value2: Any) -> Tuple[str, str]:
+        """Normalize two values into an order-independent pair, as semantic equivalence is symmetric."""
+        return tuple(sorted((self._normalize_value(value1), self._normalize_value(value2))))
+
+    @staticmethod
+    def _may_match(value1: str, value2: str) -> bool:
+        """Check if two values are similar enough for their semantic match to be worth an LLM call."""
+        # Skip semantic matching for very different length strings or very short strings
+        if abs(len(value1) - len(value2)) > 20 or min(len(value1), len(value2)) < 3:
+            return False
+        # Skip it for strings too dissimilar to be equivalent, by edit distance
+        return ratio(value1, value2) >= settings.SEMANTIC_MATCH_MIN_RATIO
+
+    async def _semantic_matches(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], bool]:
+        """
+        Check which pairs of values are semantically equivalent using GPT.
+        Verdicts are memoized for the process, and persisted in the LLM cache across runs, one entry per pair.
+        The remaining pairs are sent in structured output requests of up to SEMANTIC_MATCH_BATCH_SIZE pairs.
+        
+        Args:
+            pairs: Distinct normalized value pairs
             
-            if isinstance(v, dict):
-                items.extend(self._flatten_dict(v, new_key, sep=sep).items())
-            elif isinstance(v, list):
-                for i, item in enumerate(v):
-                    if isinstance(item, dict):
-                        items.extend(self._flatten_dict(item, f"{new_key}[{i}]", sep=sep).items())
-                    else:
-                        items.append((f"{new_key}[{i}]", item))
+        Returns:
+            Whether each pair is semantically equivalent
+        """
+        matches = {}
+        unresolved = []
+        for pair in pairs:
+            if not self._may_match(*pair):
+                matches[pair] = False
+                continue
+            is_match = _SEMANTIC_MATCHES.get((self.model_name, *pair))
+            if is_match is None:
+                unresolved.append(pair)
             else:
-                items.append((new_key, v))
-                
-        return dict(items)
+                matches[pair] = is_match
+        if not unresolved:
+            return matches
+        
+        cache_root = self.path_manager.cache_root()
+        cached = await asyncio.to_thread(
+            lambda: [llm_cache.load(cache_root, self._semantic_match_key([pair])) for pair in unresolved]
+        )
+        requested = []
+        for pair, output_text in zip(unresolved, cached):
+            if output_text is None:
+                requested.append(pair)
+            else:
+                matches[pair] = self._remember_match(pair, self._parse_semantic_matches(output_text, 1)[0])
+        
+        size = settings.SEMANTIC_MATCH_BATCH_SIZE
+        batches = [requested[i:i + size] for i in range(0, len(requested), size)]
+        verdicts = await asyncio.gather(*[self._request_semantic_matches(batch) for batch in batches])
+        for batch, batch_verdicts in zip(batches, verdicts):
+            matches.update(zip(batch, batch_verdicts))
+        return matches
 
-    def _semantic_match(self, value1: str, value2: str) -> bool:
+    async def _request_semantic_matches(self, pairs: List[Tuple[str, str]]) -> List[bool]:
         """
-        Check if two values are semantically equivalent using GPT.
+        Match a batch of value pairs in a single structured output request.
         
         Args:
-            value1: First value as string
-            value2: Second value as string
+            pairs: Value pairs missing from the memo and the LLM cache
             
         Returns:
-            True if values are semantically equivalent, False otherwise
+            Whether each pair is semantically equivalent, in order
         """
         try:
-            # Skip semantic matching for very different length strings or very short strings
-            if abs(len(value1) - len(value2)) > 20 or min(len(value1), len(value2)) < 3:
-                return False
-                
-            prompt = f"""Compare these two values and determine if they convey the same, or very similar, 
-            client information in a financial context.
-            Value 1: "{value1}"
-            Value 2: "{value2}"
-            
-            Only respond with YES if they convey the same, or very similar, client information
-            (ignoring formatting, spelling variations, and minor wording differences), or NO if they have different 
-            meanings. Just respond with YES or NO."""
-            
-            response = self.client.responses.create(
+            response = await self._create_response(
                 model=self.model_name,
                 input=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": self._semantic_match_prompt(pairs)}
                 ],
+                text=_SEMANTIC_MATCH_SCHEMA,
                 temperature=0.0  # Use deterministic output for consistency
             )
-            
-            result = response.output_text.strip()
-            return "yes" in result.lower()
+            verdicts = self._parse_semantic_matches(response.output_text, len(pairs))
         except Exception as e:
             # Log the error but fall back to exact matching in case of API failure
             print(f"Error in semantic matching: {e}")
-            return False
+            return [False] * len(pairs)
+        
+        # Store each verdict as the output of a single-pair request, so later runs reuse it whatever the batch
+        entries = [
+            (self._semantic_match_key([pair]), orjson.dumps({"matches": [{"i": 0, "match": is_match}]}).decode())
+            for pair, is_match in zip(pairs, verdicts)
+        ]
+        cache_root = self.path_manager.cache_root()
+        await asyncio.to_thread(lambda: [llm_cache.store(cache_root, key, text) for key, text in entries])
+        return [self._remember_match(pair, is_match) for pair, is_match in zip(pairs, verdicts)]
+
+    @staticmethod
+    def _semantic_match_prompt(pairs: List[Tuple[str, str]]) -> str:
+        """Build the prompt matching the given value pairs, numbered from 0."""
+        lines = "\n".join(f'{i}: "{value1}" VS "{value2}"' for i, (value1, value2) in enumerate(pairs))
+        return _SEMANTIC_MATCH_PROMPT.format(pairs=lines)
+
+    def _semantic_match_key(self, pairs: List[Tuple[str, str]]) -> str:
+        """Get the LLM cache key of the semantic match request of the given pairs."""
+        return llm_cache.cache_key(self.model_name, self._semantic_match_prompt(pairs), _SEMANTIC_MATCH_SCHEMA)
+
+    @staticmethod
+    def _parse_semantic_matches(output_text: str, count: int) -> List[bool]:
+        """
+        Parse the verdicts of a semantic match request.
+        
+        Args:
+            output_text: Structured output of the request
+            count: Number of pairs in the request
+            
+        Returns:
+            Whether each pair is semantically equivalent, False for pairs the model left out
+        """
+        verdicts = [False] * count
+        for entry in orjson.loads(output_text)["matches"]:
+            if 0 <= entry["i"] < count:
+                verdicts[entry["i"]] = entry["match"]
+        return verdicts
+
+    def _remember_match(self, pair: Tuple[str, str], is_match: bool) -> bool:
+        """Memoize the verdict of a pair for the process, and return it."""
+        if len(_SEMANTIC_MATCHES) >= SEMANTIC_MATCH_MEMO_SIZE:
+            # Evict the oldest verdict
+            del _SEMANTIC_MATCHES[next(iter(_SEMANTIC_MATCHES))]
+        _SEMANTIC_MATCHES[(self.model_name, *pair)] = is_match
+        return is_match
     
-    def _compare_values(self, value1: Any, value2: Any) -> bool:
+    def _compare_values(self, value1: Any, value2: Any) -> str:
         """
         Compare two values, handling different types and formats.
-        First tries exact matching, then falls back to semantic matching for non-matching strings.
+        Only exact matching is done here: non-matching strings are left for semantic matching.
         
         Args:
             value1: First value
             value2: Second value
             
         Returns:
-            True if values match (exactly or semantically), False otherwise
+            "exact" if values match, "no" if they do not, or "pending" if they need a semantic match
         """
+        # Identical values, the common case, need no conversion
+        if type(value1) is type(value2) and value1 == value2:
+            return "exact"
+        
         # Handle None values
-        if value1 is None and value2 is None:
-            return True
         if value1 is None or value2 is None:
-            return False
-        if MISSING_FIELD in value1 and MISSING_FIELD in value2:
-            return True
-        if MISSING_FIELD in value1 or MISSING_FIELD in value2:
-            return False
-        
-        # Convert to strings for comparison, handling different formats
-        str1 = str(value1).lower().strip()
-        str2 = str(value2).lower().strip()
+            return "no"
+        missing1 = self._contains_missing(value1)
+        missing2 = self._contains_missing(value2)
+        if missing1 or missing2:
+            return "exact" if missing1 and missing2 else "no"
         
-        # First try exact matching
-        if str1 == str2:
-            return True
+        # Then try exact matching, on strings normalized for comparison, and on numbers
+        if self._normalize_value(value1) == self._normalize_value(value2):
+            return "exact"
+        if self._numeric_equal(value1, value2):
+            return "exact"
             
         # If exact match fails, try semantic matching for potential equivalence
-        return self._semantic_match(str1, str2)
+        return "pending"
+    
+    @staticmethod
+    def _contains_missing(value: Any) -> bool:
+        """Check whether a string or list value holds the MISSING_FIELD marker."""
+        return isinstance(value, (str, list)) and MISSING_FIELD in value
+    
+    @staticmethod
+    def _numeric_equal(value1: Any, value2: Any) -> bool:
+        """Check whether two values are equal numbers, e.g. 50000 and "50000.00"."""
+        if isinstance(value1, bool) or isinstance(value2, bool):
+            return False
+        try:
+            return float(value1) == float(value2)
+        except (TypeError, ValueError):
+            return False
+    
+    @staticmethod
+    def _normalize_value(value: Any) -> str:
+        """Convert a value to a string for comparison, ignoring case and surrounding whitespace."""
+        return str(value).lower().strip()
 
     def _calculate_metrics(
         self, 
@@ -328,11 +600,8 @@ class Evaluator(BaseGenerator):
         false_negatives = 0  # Fields that should have been extracted but weren't
         
         # Count fields by category for reporting
-        categories = {
-            "present": {"total": 0, "matched": 0},
-            "extra": {"total": 0, "matched": 0},
-            "missing": {"total": 0, "matched": 0}
-        }
+        totals = Counter()
+        matched = Counter()
         
         # Analyze each field result
         for field, result in field_results.items():
@@ -340,25 +609,17 @@ class Evaluator(BaseGenerator):
             is_match = result.get("match", False)
             
             # Update category counters
-            if category in categories:
-                categories[category]["total"] += 1
-                if is_match:
-                    categories[category]["matched"] += 1
+            totals[category] += 1
+            if is_match:
+                matched[category] += 1
             
             # Update precision/recall counters
-            if category == "present":
-                if "error" in result and result["error"] == "missing_field":
-                    # Field not extracted but should have been
-                    false_negatives += 1
-                elif is_match:
-                    # Correctly extracted field
-                    true_positives += 1
-                else:
-                    # Extracted but incorrect value
-                    false_positives += 1
-            elif category == "extra":
-                # Extracted field that doesn't exist in ground truth
-                false_positives += 1
+            delta_tp, delta_fp, delta_fn = _METRIC_DELTAS.get(
+                (category, bool(is_match), result.get("error") == "missing_field"), _NO_DELTA
+            )
+            true_positives += delta_tp
+            false_positives += delta_fp
+            false_negatives += delta_fn
         
         # Calculate precision and recall
         precision = true_positives / (true_positives + false_positives) if (true_positives + false_positives) > 0 else 0
@@ -371,13 +632,13 @@ class Evaluator(BaseGenerator):
         total_judgments = true_positives + false_positives + false_negatives
         accuracy = true_positives / total_judgments if total_judgments > 0 else 0
         
-        # Calculate category accuracies
+        # Calculate category accuracies, always reporting the standard categories
         category_metrics = {}
-        for category, counts in categories.items():
+        for category in dict.fromkeys(("present", "extra", "missing", *totals)):
             category_metrics[category] = {
-                "total": counts["total"],
-                "matched": counts["matched"],
-                "accuracy": counts["matched"] / counts["total"] if counts["total"] > 0 else 0
+                "total": totals[category],
+                "matched": matched[category],
+                "accuracy": matched[category] / totals[category] if totals[category] > 0 else 0
             }
         
         # Build metrics dictionary
@@ -389,15 +650,26 @@ class Evaluator(BaseGenerator):
             "true_positives": true_positives,
             "false_positives": false_positives,
             "false_negatives": false_negatives,
-            "total_fields": sum(cat["total"] for cat in categories.values()),
+            "total_fields": sum(totals.values()),
             "missing_fields_count": len(missing_fields) if missing_fields else 0,
             "categories": category_metrics
         }
         
         return metrics
 
+    def create(self) -> str:
+        """
+        Evaluate the extracted data of the current conversation.
+        
+        Returns:
+            Path to the saved evaluation file
+        """
+        return run_async(self.acreate())
+
 
 class EvaluationAggregator(BaseGenerator):
+    __slots__ = ()
+
     def generate(self):
         """
         Aggregate evaluation metrics (accuracy, precision, recall, etc.) across conversations
@@ -406,47 +678,35 @@ class EvaluationAggregator(BaseGenerator):
             Dictionary containing aggregated metrics for the experiment
         """
         # Get the path manager for the specified experiment
-        # Get conversations for this experiment
+        # Wait for the evaluations saved in the background, then get conversations for this experiment
+        self.path_manager.flush_writes()
         conversations = self.path_manager.list_conversations()
         if not conversations:
             print(f"No conversations found in experiment: {self.path_manager.experiment_name}")
             return
 
-        # Initialize aggregation variables
-        total_conversations = 0
-        metrics_sum = {
-            'overall_accuracy': 0.0,
-            'precision': 0.0,
-            'recall': 0.0,
-            'f1_score': 0.0
-        }
+        # Metrics to average, one row of values per evaluated conversation
+        metric_keys = ('overall_accuracy', 'precision', 'recall', 'f1_score')
+        rows = []
 
-        # Process each conversation's evaluation file
+        # Resolve the evaluation files first, then read them in parallel to overlap the disk I/O
+        evaluation_paths = []
         for conversation in conversations:
             self.path_manager.set_conversation(conversation)
-            try:
-                # Load the evaluation file
-                evaluation = self.path_manager.load_json(self.path_manager.get_evaluation_path())
+            evaluation_paths.append(self.path_manager.get_evaluation_path())
 
-                # Get metrics from the evaluation
-                metrics = evaluation.get('metrics', {})
+        with ThreadPoolExecutor(max_workers=min(AGGREGATION_WORKERS, len(evaluation_paths))) as executor:
+            for metrics in executor.map(self._load_metrics, evaluation_paths):
                 if metrics:
-                    total_conversations += 1
-
-                    # Add to our running totals
-                    for key in metrics_sum.keys():
-                        if key in metrics:
-                            metrics_sum[key] += metrics[key]
-
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                print(f"Error processing {self.path_manager.get_evaluation_path()}: {e}")
+                    rows.append([metrics.get(key, 0.0) for key in metric_keys])
 
-        # Calculate averages
+        # Calculate averages, one reduction per metric
+        total_conversations = len(rows)
         aggregated_metrics = {}
         if total_conversations > 0:
             aggregated_metrics = {
-                key: value / total_conversations
-                for key, value in metrics_sum.items()
+                key: statistics.fmean(column)
+                for key, column in zip(metric_keys, zip(*rows))
             }
 
         # Prepare the aggregated results
@@ -458,6 +718,24 @@ class EvaluationAggregator(BaseGenerator):
 
         return aggregated_results
 
+    @staticmethod
+    def _load_metrics(evaluation_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the metrics of a conversation evaluation.
+        
+        Args:
+            evaluation_path: Path to the evaluation file
+            
+        Returns:
+            The evaluation metrics, or None if the file is missing or invalid
+        """
+        try:
+            # Reuse the parsed metrics if the file did not change since the last run
+            return _read_metrics(evaluation_path, ExperimentPathManager.artifact_mtime_ns(evaluation_path))
+        except (FileNotFoundError, *JSON_READ_ERRORS) as e:
+            print(f"Error processing {evaluation_path}: {e}")
+            return None
+
     def save(self, output: Union[str, Dict[str, Any]]) -> str:
         return self.path_manager.save_json(output, os.path.join(self.path_manager.experiment_dir,
                                                                 "aggregated_results.json"))
@@ -1,10 +1,22 @@
-import json
 from typing import Dict, Any
 
-from openai import OpenAI
+import orjson
 
 from core.base import BaseGenerator
-from utils import settings, MISSING_FIELD
+from utils import MISSING_FIELD
+
+# The prompt has no per-call inputs, so it is built once at import time
+_PROMPT = (
+    "You are a financial advisor that has had an interview with a client "
+    "and needs to fill in the 'Fact Find' form."
+    "Please fill in the form as given in the JSON schema with varied and random, but plausible "
+    "financial client information that is likely to occur in a real-life "
+    "scenario. Be creative. Please, when quoting money, don't put currencies, "
+    "but just provide the numbers as a string."
+    " Please mark some of the fields (between 10-30 % of all fields) "
+    f"for filling in as '{MISSING_FIELD}' at random and avoid adding {MISSING_FIELD} in list item fields. "
+    "Please only output the JSON dictionary."
+)
 
 
 class ExampleFormGenerator(BaseGenerator):
@@ -15,8 +27,8 @@ class ExampleFormGenerator(BaseGenerator):
     Of course, we can also obfuscate fields programmatically, but we want to be quick and dirty,
     so the LLM does it for us.
     """
-    model_name = "gpt-4.5-preview"
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    __slots__ = ()
+    default_model_name = "gpt-4.5-preview"
 
     def generate(self) -> Dict[str, Any]:
         """
@@ -37,7 +49,7 @@ class ExampleFormGenerator(BaseGenerator):
         )
 
         # Parse the response to get the form data
-        form_data = json.loads(self.strip_markdown_code_block(response.output_text))
+        form_data = orjson.loads(self.strip_markdown_code_block(response.output_text))
         return form_data
 
     def save(self, form_data: Dict[str, Any]) -> str:
@@ -56,15 +68,7 @@ class ExampleFormGenerator(BaseGenerator):
         """
         Not directly used in this implementation.
         """
-        return ("You are a financial advisor that has had an interview with a client "
-                "and needs to fill in the 'Fact Find' form."
-                "Please fill in the form as given in the JSON schema with varied and random, but plausible "
-                "financial client information that is likely to occur in a real-life "
-                f"scenario. Be creative. Please, when quoting money, don't put currencies, "
-                f"but just provide the numbers as a string."
-                f" Please mark some of the fields (between 10-30 % of all fields) "
-                f"for filling in as '{MISSING_FIELD}' at random and avoid adding {MISSING_FIELD} in list item fields. "
-                f"Please only output the JSON dictionary.")
+        return _PROMPT
                 
     def create(self) -> str:
         """
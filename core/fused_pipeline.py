@@ -0,0 +1,83 @@
+"""
+Fused Pipeline module.
+Generates a conversation and extracts its structured data in one chained Responses API session, so the
+extraction turn reuses the conversation already held by the API instead of re-uploading the transcript.
+"""
+
+import asyncio
+from typing import Optional, Tuple
+
+from core.conversation_generator import ConversationGenerator
+from core.data_extractor import DataExtractor
+from utils import MISSING_FIELD
+from utils.paths import ExperimentPathManager
+
+_CONVERSATION_TURN = "Generate the conversation now."
+
+# Same instructions as the DataExtractor prompt, pointing at the conversation of the previous turn
+_EXTRACTION_TURN = (
+    "You are now a data extraction expert. Your task is to extract structured data from "
+    "the financial onboarding conversation transcript you just generated, according to a provided schema. "
+    "Only include information that is explicitly mentioned or can be confidently inferred "
+    f"from the conversation. If information is missing or unclear, mark the field with {MISSING_FIELD}.\n\n"
+    "Please extract all relevant information from this conversation and format it "
+    "according to the provided JSON schema. "
+    "Do not include currency signs, just provide the numbers as a string. "
+    "Output only the valid JSON data without any "
+    "additional explanations."
+)
+
+
+async def run_fused(path_mgr: ExperimentPathManager,
+                    conversation_model: Optional[str] = None,
+                    extraction_model: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Generate the conversation of the current conversation directory and extract its data, chaining the
+    extraction request to the generation response through `previous_response_id`.
+    The generation prompt, which holds the ground truth, is sent as `instructions`: these are not carried over
+    to chained responses, so the extraction turn only sees the conversation, as in the standalone pipeline.
+    Chained responses cannot be replayed from the LLM cache. When the conversation itself is served from the
+    cache there is no response to chain to, so the data is extracted from the transcript as in the standalone
+    pipeline.
+
+    Args:
+        path_mgr: Path manager set to a conversation with ground truth data
+        conversation_model: Model used to generate the conversation (defaults to CONVERSATION_MODEL)
+        extraction_model: Model used to extract the data (defaults to EXTRACTION_MODEL)
+
+    Returns:
+        Tuple of (conversation_path, extracted_data_path)
+    """
+    conversation_gen = ConversationGenerator(path_mgr, model_name=conversation_model)
+    extractor = DataExtractor(path_mgr, model_name=extraction_model)
+
+    conversation_prompt, _ = await asyncio.to_thread(conversation_gen.prepare_request)
+    schema = await asyncio.to_thread(path_mgr.load_schema)
+
+    conversation_text, conversation_response_id = await conversation_gen.arespond(
+        model=conversation_gen.model_name,
+        instructions=conversation_prompt,
+        input=[{"role": "user", "content": _CONVERSATION_TURN}],
+    )
+    # Save the conversation while the extraction turn is in flight
+    save_conversation = asyncio.create_task(asyncio.to_thread(conversation_gen.save, conversation_text))
+
+    if conversation_response_id is None:
+        # The extraction reads the saved transcript
+        conversation_path = await save_conversation
+        extracted_data = await extractor.generate()
+    else:
+        try:
+            extraction_text, _ = await extractor.arespond(
+                model=extractor.model_name,
+                previous_response_id=conversation_response_id,
+                input=[{"role": "user", "content": _EXTRACTION_TURN}],
+                text=schema,
+            )
+            extracted_data = extractor.parse_output(extraction_text)
+        finally:
+            # Wait for the save even if the extraction failed, so its own errors are not lost
+            conversation_path = await save_conversation
+
+    extracted_data_path = await asyncio.to_thread(extractor.save, extracted_data)
+    return conversation_path, extracted_data_path
@@ -0,0 +1,56 @@
+"""
+HTTP Client module.
+Provides the httpx clients shared by all OpenAI clients, so every generator draws from a single HTTP/2 connection
+pool instead of opening its own connections.
+"""
+
+import asyncio
+import functools
+import weakref
+
+import httpx
+from openai import OpenAI
+
+from utils import settings
+
+# httpx async clients are bound to the event loop that opened their connections, so one is shared per loop
+_ASYNC_HTTP_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client of the running event loop, creating it on first use.
+    HTTP/2 multiplexes the concurrent requests over a few keepalive connections, saving per-request handshakes.
+    """
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _ASYNC_HTTP_CLIENTS[loop] = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
+            timeout=httpx.Timeout(120.0, connect=5.0),
+        )
+    return client
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_openai_client() -> OpenAI:
+    """
+    Get the synchronous OpenAI client shared by the whole process, creating it on first use.
+    Its HTTP/2 connections are kept alive between requests, so sequential calls skip the TLS handshake.
+    """
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(120.0, connect=5.0),
+        ),
+    )
+
+
+async def close_shared_http_client() -> None:
+    """Close the shared async HTTP client of the running event loop, if any."""
+    client = _ASYNC_HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
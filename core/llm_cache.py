@@ -0,0 +1,80 @@
+"""
+LLM Cache module.
+Content-addressed on-disk cache of model outputs, so that byte-identical requests are not sent twice.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Any, Optional
+
+from utils import settings
+
+# Can be toggled at runtime; defaults to the LLM_CACHE_ENABLED setting
+enabled = settings.LLM_CACHE_ENABLED
+
+
+def cache_key(model: str, prompt: str, schema: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the cache key of a request.
+
+    Args:
+        model: Name of the model the request is sent to
+        prompt: The prompt text
+        schema: Structured output schema of the request, if any
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    payload = json.dumps({"m": model, "p": prompt, "s": schema}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cache_path(cache_root: str, key: str) -> str:
+    """Get the path of a cache entry, sharded by the first two hex digits of the key."""
+    return os.path.join(cache_root, key[:2], f"{key}.json")
+
+
+def load(cache_root: str, key: str) -> Optional[str]:
+    """
+    Load a cached model output.
+
+    Args:
+        cache_root: Root directory of the cache
+        key: Cache key of the request
+
+    Returns:
+        The cached output text, or None on a miss or when the cache is disabled
+    """
+    if not enabled:
+        return None
+
+    path = cache_path(cache_root, key)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)["output_text"]
+
+
+def store(cache_root: str, key: str, output_text: str) -> None:
+    """
+    Store a model output in the cache.
+    The entry is written to a temporary file first and moved into place, so readers never see partial entries.
+
+    Args:
+        cache_root: Root directory of the cache
+        key: Cache key of the request
+        output_text: The model output to cache
+    """
+    if not enabled:
+        return
+
+    path = cache_path(cache_root, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({"output_text": output_text}, f)
+    os.replace(tmp_path, path)
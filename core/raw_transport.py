@@ -0,0 +1,122 @@
+"""
+Raw Transport module.
+Posts Responses API requests directly through aiohttp, bypassing the OpenAI SDK's httpx client,
+which sustains fewer concurrent requests in bulk pipeline runs.
+"""
+
+import asyncio
+import weakref
+from typing import Dict, Any, Mapping
+
+import aiohttp
+import httpx
+import orjson
+from openai import (APIConnectionError, APIStatusError, APITimeoutError, AuthenticationError, BadRequestError,
+                    ConflictError, InternalServerError, NotFoundError, PermissionDeniedError, RateLimitError,
+                    UnprocessableEntityError)
+
+from utils import settings
+
+RESPONSES_URL = "https://api.openai.com/v1/responses"
+
+# Map HTTP error statuses to the SDK exceptions, so retries and error handling behave as with the SDK
+_STATUS_ERRORS = {
+    400: BadRequestError,
+    401: AuthenticationError,
+    403: PermissionDeniedError,
+    404: NotFoundError,
+    409: ConflictError,
+    422: UnprocessableEntityError,
+    429: RateLimitError,
+}
+
+# Sessions are bound to the event loop that created them
+_SESSIONS = weakref.WeakKeyDictionary()
+
+
+class RawResponse:
+    """
+    Minimal stand-in for the SDK's Response object, built from the raw JSON body.
+    """
+
+    def __init__(self, body: Dict[str, Any], headers: Mapping[str, str]):
+        self.body = body
+        self.headers = headers
+
+    @property
+    def id(self) -> str:
+        return self.body["id"]
+
+    @property
+    def output_text(self) -> str:
+        """Concatenated text of all output messages, as the SDK's `output_text` property."""
+        return "".join(
+            content["text"]
+            for item in self.body.get("output", [])
+            if item.get("type") == "message"
+            for content in item.get("content", [])
+            if content.get("type") == "output_text"
+        )
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the aiohttp session of the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        session = _SESSIONS[loop] = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=256, limit_per_host=256, ttl_dns_cache=300),
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+            timeout=aiohttp.ClientTimeout(total=120, connect=5),
+        )
+    return session
+
+
+async def close_session() -> None:
+    """Close the aiohttp session of the running event loop, if any."""
+    session = _SESSIONS.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def responses_create(**payload) -> RawResponse:
+    """
+    Create a response through a direct POST to the Responses API.
+
+    Args:
+        payload: Request body, with the same fields as `client.responses.create` kwargs
+
+    Returns:
+        The response, exposing `output_text` and the rate limit `headers`
+
+    Raises:
+        APIStatusError: The SDK exception matching the HTTP error status
+        APIConnectionError: If the connection failed
+        APITimeoutError: If the request timed out
+    """
+    request = httpx.Request("POST", RESPONSES_URL)
+    try:
+        async with _get_session().post(RESPONSES_URL, json=payload) as resp:
+            raw_body = await resp.read()
+            # A case-insensitive mapping, which stays valid once the response is released
+            headers = resp.headers
+            status = resp.status
+    except asyncio.TimeoutError as e:
+        raise APITimeoutError(request=request) from e
+    except aiohttp.ClientError as e:
+        raise APIConnectionError(request=request) from e
+
+    try:
+        body = orjson.loads(raw_body)
+    except orjson.JSONDecodeError:
+        # Gateways answer 502/503/504 with HTML pages, which are mapped to the SDK exception from the status alone
+        if status < 400:
+            raise
+        body = raw_body.decode('utf-8', errors='replace')
+
+    if status >= 400:
+        error_cls = _STATUS_ERRORS.get(status, InternalServerError if status >= 500 else APIStatusError)
+        message = (body.get("error") or {}).get("message", f"HTTP {status}") if isinstance(body, dict) else str(body)
+        raise error_cls(message, response=httpx.Response(status, headers=headers, request=request), body=body)
+
+    return RawResponse(body, headers)
@@ -6,6 +6,8 @@ from core.base import BaseGenerator
 
 
 class SchemaGenerator(BaseGenerator):
+    __slots__ = ()
+
     def generate(self) -> Dict[str, Any]:
         # Create a schema builder instance
 
@@ -42,19 +44,20 @@ class SchemaGenerator(BaseGenerator):
     @staticmethod
     def enforce_additional_properties_false(schema):
         """
-        Recursively traverse the schema and add "additionalProperties": False to all objects.
+        Traverse the schema iteratively and add "additionalProperties": False to all objects.
         """
-        if isinstance(schema, dict):
-            # If the current schema represents an object, enforce additionalProperties to be False.
-            if schema.get("type") == "object":
-                schema["additionalProperties"] = False
-                # Recursively process all properties.
-                if "properties" in schema:
-                    for prop in schema["properties"].values():
-                        SchemaGenerator.enforce_additional_properties_false(prop)
-            # If the schema defines an array, process its "items".
-            if "items" in schema:
-                SchemaGenerator.enforce_additional_properties_false(schema["items"])
-        elif isinstance(schema, list):
-            for item in schema:
-                SchemaGenerator.enforce_additional_properties_false(item)
\ No newline at end of file
+        stack = [schema]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                # If the current schema represents an object, enforce additionalProperties to be False.
+                if node.get("type") == "object":
+                    node["additionalProperties"] = False
+                    # Process all properties.
+                    if "properties" in node:
+                        stack.extend(node["properties"].values())
+                # If the schema defines an array, process its "items".
+                if "items" in node:
+                    stack.append(node["items"])
+            elif isinstance(node, list):
+                stack.extend(node)
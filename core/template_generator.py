@@ -3,13 +3,20 @@ Template Generator module.
 Takes in documents and prompts an LLM to generate JSON templates.
 """
 
-import json
 from typing import Dict, Any
-from openai import OpenAI
 
-from utils import settings
+import orjson
+
 from core.base import BaseGenerator
 
+# The prompt has no per-call inputs, so it is built once at import time
+_PROMPT = """You are a useful helper that takes a table structure used for recording client data in a financial onboarding process. 
+         Your task is to take a PDF file and transfer the found forms into a JSON template accurately, 
+         nesting fields when necessary. If the field is a list, please indicate it with a list with an empty string - [""].
+         If the file contains multiple instances of the same form, please only capture a single instance of it.
+        Please only output the JSON dictionary template. 
+    """
+
 
 class TemplateGenerator(BaseGenerator):
     """
@@ -25,8 +32,8 @@ class TemplateGenerator(BaseGenerator):
         - to confirm template, we can open the PDF manually and find that every generated key exists as text
         in the PDF
     """
-    model_name = "gpt-4o-mini"
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    __slots__ = ()
+    default_model_name = "gpt-4o-mini"
 
     def generate(self,
     ) -> Dict[str, Any]:
@@ -62,16 +69,12 @@ class TemplateGenerator(BaseGenerator):
             ]
         )
 
-        return json.loads(self.strip_markdown_code_block(response.output_text))
+        return orjson.loads(self.strip_markdown_code_block(response.output_text))
 
     def save(self, file_path):
         template = self.generate()
         return self.path_manager.save_template(template)
 
     def get_prompt(self) -> str:
-        return f"""You are a useful helper that takes a table structure used for recording client data in a financial onboarding process. 
-         Your task is to take a PDF file and transfer the found forms into a JSON template accurately, 
-         nesting fields when necessary. If the field is a list, please indicate it with a list with an empty string - [""].
-         If the file contains multiple instances of the same form, please only capture a single instance of it.
-        Please only output the JSON dictionary template. 
-    """
+        return _PROMPT
+
@@ -1,22 +1,19 @@
 """Main script for the financial onboarding data extraction pipeline."""
 
 import argparse
-import json
-import os
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
 
-from core.conversation_generator import ConversationGenerator
-from core.data_extractor import DataExtractor
-from core.evaluation_generator import Evaluator, EvaluationAggregator
-from core.example_forms_generator import ExampleFormGenerator
-from core.schema_generator import SchemaGenerator
-from core.template_generator import TemplateGenerator
-from core.template_shortener import TemplateShortener
-from utils.paths import get_experiment
+from utils.paths import flush_artifact_writes, get_experiment
+
+# The generators (and the OpenAI SDK behind them) are imported by the commands that use them, to keep startup fast
 
 
 def create_template(pdf_name: Optional[str] = "General Fact Find Template.pdf"):
     """Create JSON template from PDF document and an abridged version."""
+    from core.template_generator import TemplateGenerator
+    from core.template_shortener import TemplateShortener
+
     path_manager = get_experiment()
     path_manager.pdf_path = pdf_name
     template_gen = TemplateGenerator(path_manager)
@@ -28,6 +25,8 @@ def create_template(pdf_name: Optional[str] = "General Fact Find Template.pdf"):
 
 def setup_experiment():
     """Set up a new experiment, generating template, schema, and form."""
+    from core.schema_generator import SchemaGenerator
+
     path_manager = get_experiment()
     # Generate JSON schema from the template
     schema_gen = SchemaGenerator(path_manager)
@@ -35,38 +34,223 @@ def setup_experiment():
     return path_manager
 
 
+def _run_one(experiment_name: str,
+             conversation_model: Optional[str] = None,
+             extraction_model: Optional[str] = None) -> str:
+    """
+    Run the pipeline of one new conversation, from ground truth to evaluation.
+    It may run in a worker process, so it builds its own path manager.
+
+    Returns:
+        Path to the evaluation file
+    """
+    from core.base import shared_event_loop
+    from core.conversation_generator import ConversationGenerator
+    from core.data_extractor import DataExtractor
+    from core.evaluation_generator import Evaluator
+    from core.example_forms_generator import ExampleFormGenerator
+
+    path_manager = get_experiment(experiment_name)
+
+    try:
+        # All stages run on one event loop, so they share the API clients and their connections
+        with shared_event_loop():
+            # Create a new conversation
+            path_manager.create_conversation()
+            conversation_name = path_manager.conversation_name
+            print(f"Processing conversation: {conversation_name}")
+
+            # Generate ground truth with randomly removed fields
+            form_gen = ExampleFormGenerator(path_manager)
+            form_gen.create()
+            print(f"{conversation_name}: generated ground truth data with removed fields")
+
+            # Generate conversation based on ground truth
+            conv_gen = ConversationGenerator(path_manager, model_name=conversation_model)
+            conv_gen.create()
+            print(f"{conversation_name}: generated simulated conversation")
+
+            # Extract data from conversation
+            extractor = DataExtractor(path_manager, model_name=extraction_model)
+            extractor.create()
+            print(f"{conversation_name}: extracted structured data from conversation")
+
+            # Evaluate extraction against ground truth
+            evaluator = Evaluator(path_manager)
+            return evaluator.create()
+    finally:
+        # Worker processes exit without running atexit handlers, so the artifacts saved in the background
+        # (including those of the stages that completed before a failure) are flushed here
+        path_manager.flush_writes()
+
+
+def _run_concurrently(experiment_name: str,
+                      num_conversations: int,
+                      conversation_model: Optional[str] = None,
+                      extraction_model: Optional[str] = None) -> List[str]:
+    """
+    Run the pipeline of several new conversations on one event loop, gathering each stage across the
+    conversations so their API requests overlap (up to MAX_CONCURRENT_REQUESTS in flight).
+
+    Returns:
+        Paths to the evaluation files
+    """
+    from core.base import run_batch, shared_event_loop
+    from core.conversation_generator import ConversationGenerator
+    from core.data_extractor import DataExtractor
+    from core.evaluation_generator import Evaluator
+    from core.example_forms_generator import ExampleFormGenerator
+
+    try:
+        with shared_event_loop():
+            # Generate the ground truths, keeping a dedicated path manager per conversation for the gathered stages
+            conversation_managers = []
+            for _ in range(num_conversations):
+                conversation_manager = get_experiment(experiment_name)
+                conversation_manager.create_conversation()
+                print(f"Processing conversation: {conversation_manager.conversation_name}")
+                ExampleFormGenerator(conversation_manager).create()
+                conversation_managers.append(conversation_manager)
+            print(f"Generated ground truth data for {num_conversations} conversations")
+
+            run_batch([ConversationGenerator(manager, model_name=conversation_model)
+                       for manager in conversation_managers])
+            print("Generated simulated conversations")
+
+            run_batch([DataExtractor(manager, model_name=extraction_model) for manager in conversation_managers])
+            print("Extracted structured data from conversations")
+
+            return run_batch([Evaluator(manager) for manager in conversation_managers])
+    finally:
+        # Keep the artifacts of the stages that completed before a failure
+        flush_artifact_writes()
+
+
+def _init_worker(workers: int) -> None:
+    """
+    Split the request concurrency and the rate limits of the API key between the worker processes,
+    as each of them builds its own semaphore and rate limiter.
+
+    Args:
+        workers: Number of worker processes
+    """
+    from utils import settings
+    from utils.ratelimit import rate_limiter
+
+    settings.MAX_CONCURRENT_REQUESTS = max(1, settings.MAX_CONCURRENT_REQUESTS // workers)
+    rate_limiter.set_limits(max(1, settings.RATE_LIMIT_RPM // workers), max(1, settings.RATE_LIMIT_TPM // workers))
+
+
 def run_conversation_pipeline(experiment_name: Optional[str] = None,
-                              num_conversations: int = 1):
-    """Run the full pipeline including ground truth, conversation, extraction, and evaluation."""
+                              num_conversations: int = 1,
+                              conversation_model: Optional[str] = None,
+                              extraction_model: Optional[str] = None,
+                              workers: int = 1):
+    """
+    Run the full pipeline including ground truth, conversation, extraction, and evaluation.
+    Conversations are independent: their requests overlap on one event loop, and with `workers` > 1 they run in
+    parallel worker processes, which share the request concurrency and rate limits of the process between them.
+    """
+    from core.evaluation_generator import EvaluationAggregator
+
     # Set up the experiment
     path_manager = get_experiment(experiment_name)
+    workers = min(num_conversations, workers)
 
-    # Loop through the number of conversations to generate
+    if workers <= 1:
+        for eval_path in _run_concurrently(path_manager.experiment_name, num_conversations,
+                                           conversation_model, extraction_model):
+            print(f"Evaluation complete and saved to {eval_path}")
+        print("---")
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as pool:
+            futures = [
+                pool.submit(_run_one, path_manager.experiment_name, conversation_model, extraction_model)
+                for _ in range(num_conversations)
+            ]
+            for future in as_completed(futures):
+                print(f"Evaluation complete and saved to {future.result()}")
+                print("---")
+
+    aggregator = EvaluationAggregator(path_manager)
+    agg_path = aggregator.create()
+    print(f"Evaluation metrics aggregated and saved to {agg_path}")
+    print("---")
+
+
+def run_fused_pipeline(experiment_name: Optional[str] = None,
+                       num_conversations: int = 1,
+                       conversation_model: Optional[str] = None,
+                       extraction_model: Optional[str] = None):
+    """Run the full pipeline, generating each conversation and extracting its data in one chained API session."""
+    from core.base import run_async, shared_event_loop
+    from core.evaluation_generator import Evaluator, EvaluationAggregator
+    from core.example_forms_generator import ExampleFormGenerator
+    from core.fused_pipeline import run_fused
+
+    path_manager = get_experiment(experiment_name)
+
+    with shared_event_loop():
+        for _ in range(num_conversations):
+            path_manager.create_conversation()
+            print(f"Processing conversation: {path_manager.conversation_name}")
+
+            ExampleFormGenerator(path_manager).create()
+            print("Generated ground truth data with removed fields")
+
+            run_async(run_fused(path_manager, conversation_model, extraction_model))
+            print("Generated simulated conversation and extracted structured data")
+
+            eval_path = Evaluator(path_manager).create()
+            path_manager.commit_conversation()
+            print(f"Evaluation complete and saved to {eval_path}")
+            print("---")
+
+    aggregator = EvaluationAggregator(path_manager)
+    agg_path = aggregator.create()
+    print(f"Evaluation metrics aggregated and saved to {agg_path}")
+    print("---")
+
+
+def run_batch_pipeline(experiment_name: Optional[str] = None,
+                       num_conversations: int = 1,
+                       conversation_model: Optional[str] = None,
+                       extraction_model: Optional[str] = None):
+    """Run the pipeline with conversation generation and extraction submitted through the Batch API."""
+    from core.base import shared_event_loop
+    from core.batch_runner import BatchRunner
+    from core.conversation_generator import ConversationGenerator
+    from core.data_extractor import DataExtractor
+    from core.evaluation_generator import Evaluator, EvaluationAggregator
+    from core.example_forms_generator import ExampleFormGenerator
+
+    path_manager = get_experiment(experiment_name)
+
+    # Generate the ground truths, keeping a dedicated path manager per conversation for the batched stages
+    conversation_managers = []
     for _ in range(num_conversations):
-        # Create a new conversation
         path_manager.create_conversation()
-        print(f"Processing conversation: {path_manager.conversation_name}")
-
-        # Generate ground truth with randomly removed fields
-        form_gen = ExampleFormGenerator(path_manager)
-        form_gen.create()
-        print("Generated ground truth data with removed fields")
-
-        # Generate conversation based on ground truth
-        conv_gen = ConversationGenerator(path_manager)
-        conv_gen.create()
-        print("Generated simulated conversation")
-
-        # Extract data from conversation
-        extractor = DataExtractor(path_manager)
-        extractor.create()
-        print("Extracted structured data from conversation")
-
-        # Evaluate extraction against ground truth
-        evaluator = Evaluator(path_manager)
-        eval_path = evaluator.create()
-        print(f"Evaluation complete and saved to {eval_path}")
-        print("---")
+        conversation_manager = get_experiment(path_manager.experiment_name)
+        conversation_manager.set_conversation(path_manager.conversation_name)
+        ExampleFormGenerator(conversation_manager).create()
+        conversation_managers.append(conversation_manager)
+    print(f"Generated ground truth data for {num_conversations} conversations")
+
+    runner = BatchRunner()
+    runner.run([ConversationGenerator(manager, model_name=conversation_model) for manager in conversation_managers])
+    print("Generated simulated conversations")
+
+    runner.run([DataExtractor(manager, model_name=extraction_model) for manager in conversation_managers])
+    print("Extracted structured data from conversations")
+
+    with shared_event_loop():
+        for manager in conversation_managers:
+            # Skip conversations whose batch requests failed
+            if manager.has_extracted_data():
+                eval_path = Evaluator(manager).create()
+                print(f"Evaluation complete and saved to {eval_path}")
+            manager.commit_conversation()
+    print("---")
 
     aggregator = EvaluationAggregator(path_manager)
     agg_path = aggregator.create()
@@ -82,6 +266,16 @@ def main():
     parser.add_argument("--setup-schema", action="store_true", help="Generate schema from template")
     parser.add_argument("--pdf-name", type=str, default="General Fact Find Template.pdf", 
                       help="PDF file to use for template creation. Please put it in the results folder.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit conversation generation and extraction through the OpenAI Batch API")
+    parser.add_argument("--fused", action="store_true",
+                        help="Chain conversation generation and extraction in one Responses API session")
+    parser.add_argument("--conversation-model", type=str, default=None,
+                        help="Model used to simulate conversations (defaults to CONVERSATION_MODEL)")
+    parser.add_argument("--extraction-model", type=str, default=None,
+                        help="Model used to extract data from conversations (defaults to EXTRACTION_MODEL)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes running conversations in parallel (rate limits are split between them)")
     args = parser.parse_args()
     
     if args.create_template:
@@ -90,7 +284,19 @@ def main():
     if args.setup_schema:
         setup_experiment()
     
-    run_conversation_pipeline(experiment_name=args.experiment, num_conversations=5)
+    if args.batch:
+        run_batch_pipeline(experiment_name=args.experiment, num_conversations=args.conversations,
+                           conversation_model=args.conversation_model, extraction_model=args.extraction_model)
+    elif args.fused:
+        run_fused_pipeline(experiment_name=args.experiment, num_conversations=args.conversations,
+                           conversation_model=args.conversation_model, extraction_model=args.extraction_model)
+    else:
+        run_conversation_pipeline(experiment_name=args.experiment, num_conversations=args.conversations,
+                                  conversation_model=args.conversation_model,
+                                  extraction_model=args.extraction_model, workers=args.workers)
+
+    # Conversation artifacts are saved in the background
+    flush_artifact_writes()
 
 
 if __name__ == '__main__':
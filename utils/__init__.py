@@ -7,6 +7,15 @@ os.makedirs(RESULTS_DIR, exist_ok=True)
 TEMPLATE_FILENAME = "template.json"
 TEMPLATE_FILENAME_ABR = "template_short.json"
 SCHEMA_FILENAME = "schema_short.json"
+LLM_CACHE_DIRNAME = ".llm_cache"
+NEXT_ID_FILENAME = ".next_id"
+PACKED_ARTIFACTS_FILENAME = "artifacts.msgpack"
+
+# Global files shared by all experiments, joined once at import
+TEMPLATE_PATH = os.path.join(RESULTS_DIR, TEMPLATE_FILENAME)
+TEMPLATE_ABR_PATH = os.path.join(RESULTS_DIR, TEMPLATE_FILENAME_ABR)
+SCHEMA_PATH = os.path.join(RESULTS_DIR, SCHEMA_FILENAME)
+LLM_CACHE_ROOT = os.path.join(RESULTS_DIR, LLM_CACHE_DIRNAME)
 
 MISSING_FIELD = "MISSING INFORMATION"
 TEMPERATURE = 0.9
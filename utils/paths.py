@@ -2,16 +2,414 @@
 Path management, that centralizes all path operations to ensure consistency across the application.
 """
 
+import atexit
+import io
 import os
 import re
-import json
+import queue
 import shutil
-from typing import Dict, Any, List, Optional
+import sys
+import threading
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
+from functools import cached_property
 
+import fastjsonschema
+import msgpack
 import names_generator
+import orjson
 
-from utils import RESULTS_DIR, TEMPLATE_FILENAME, SCHEMA_FILENAME, TEMPLATE_FILENAME_ABR
+try:
+    import fcntl
+except ImportError:  # Conversation numbers are then allocated from directory listings
+    fcntl = None
+
+try:
+    import ijson
+except ImportError:  # JSON files are then parsed whole by `iter_json_key`
+    ijson = None
+
+from utils import (RESULTS_DIR, TEMPLATE_PATH, SCHEMA_PATH, TEMPLATE_ABR_PATH, LLM_CACHE_ROOT, NEXT_ID_FILENAME,
+                   PACKED_ARTIFACTS_FILENAME, settings)
+
+# Parsed shared files (schema, templates) by absolute path, with the modification time they were parsed at,
+# shared by all path managers of the process. Cached data must be treated as read-only.
+_JSON_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+# Bumped by every shared file save of the process, invalidating the shared files memoized by path managers
+_SHARED_JSON_VERSION = 0
+
+# Compiled schema validators by schema path, with the parsed schema they were compiled from
+_VALIDATORS: Dict[str, Tuple[Dict[str, Any], Callable[[Any], Any]]] = {}
+
+# Errors raised when reading an invalid JSON file, whole or streamed
+JSON_READ_ERRORS = (orjson.JSONDecodeError,) if ijson is None else (orjson.JSONDecodeError, ijson.JSONError)
+
+# Conversation directory names, capturing the conversation number
+_CONV_RE = re.compile(r"^conversation_(\d+)$")
+
+# Linux ioctl sharing the blocks of a file with another one (copy-on-write reflink, e.g. on btrfs or XFS)
+_FICLONE = 0x40049409
+
+# Bytes handed to each os.sendfile call when copying files
+SENDFILE_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _fastcopy(src: str, dst: str) -> None:
+    """
+    Copy a file with its metadata, through os.sendfile where available, so the data never enters user space.
+    Falls back to shutil.copyfile.
+    
+    Args:
+        src: Path of the file to copy
+        dst: Path of the copy
+    """
+    copied = False
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                offset = 0
+                while True:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, SENDFILE_CHUNK_SIZE)
+                    if sent == 0:
+                        break
+                    offset += sent
+            copied = True
+        except OSError:
+            # Unsupported by the filesystem, e.g. on some network or FUSE mounts
+            pass
+    if not copied:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _clone_file(src: str, dst: str) -> None:
+    """
+    Copy a file with its metadata, through a reflink where the filesystem supports it, so no data is copied.
+    Falls back to a sendfile copy.
+    
+    Args:
+        src: Path of the file to copy
+        dst: Path of the copy
+    """
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            # Unsupported by the filesystem, or across filesystems
+            pass
+    _fastcopy(src, dst)
+
+
+def _write_bytes(file_path: str, payload: bytes) -> None:
+    """
+    Write encoded content to a file, replacing it, through raw file descriptor calls.
+    Skipping the buffered file object saves its buffer management and close-time flush on small artifacts.
+    
+    Args:
+        file_path: Path of the file
+        payload: Encoded content of the file
+    """
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        # A single call writes small payloads whole, but os.write may stop short on large ones
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# Maximum number of artifact writes waiting for the background writer before `submit` blocks
+ARTIFACT_QUEUE_SIZE = 256
+
+
+class AsyncArtifactWriter:
+    """
+    Writes conversation artifacts from a background thread, so saving them stays off the pipeline's critical path.
+    Files waiting to be written are served from memory by `pending`, so they can be read back right away.
+    """
+
+    def __init__(self, max_queued: int = ARTIFACT_QUEUE_SIZE):
+        """
+        Initialize the writer and start its thread.
+        
+        Args:
+            max_queued: Maximum number of queued writes, beyond which `submit` blocks
+        """
+        self.pid = os.getpid()
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._pending: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._worker, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, file_path: str, payload: bytes) -> None:
+        """
+        Queue the write of a file, replacing its content.
+        Blocks while the queue is full, so a slow disk throttles the pipeline instead of filling the memory.
+        
+        Args:
+            file_path: Absolute path of the file, whose directory must exist
+            payload: Encoded content of the file
+        """
+        with self._lock:
+            self._pending[file_path] = payload
+        self._queue.put((file_path, payload))
+
+    def pending(self, file_path: str) -> Optional[bytes]:
+        """Get the content of a file that is not written yet, or None if it has no pending write."""
+        with self._lock:
+            return self._pending.get(file_path)
+
+    def flush(self) -> None:
+        """
+        Wait for all queued writes to reach the disk.
+        
+        Raises:
+            OSError: The first error of the failed writes since the last flush
+        """
+        self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _worker(self) -> None:
+        while True:
+            file_path, payload = self._queue.get()
+            try:
+                _write_bytes(file_path, payload)
+            except Exception as e:
+                print(f"Error writing {file_path}: {e}")
+                self._error = self._error or e
+            finally:
+                with self._lock:
+                    # A newer write of the same file stays pending
+                    if self._pending.get(file_path) is payload:
+                        del self._pending[file_path]
+                self._queue.task_done()
+
+
+_ARTIFACT_WRITER: Optional[AsyncArtifactWriter] = None
+_ARTIFACT_WRITER_LOCK = threading.Lock()
+
+
+def artifact_writer() -> AsyncArtifactWriter:
+    """
+    Get the artifact writer of the process, starting it on first use.
+    Forked processes do not inherit the writer thread, so they start their own.
+    """
+    global _ARTIFACT_WRITER
+    with _ARTIFACT_WRITER_LOCK:
+        if _ARTIFACT_WRITER is None or _ARTIFACT_WRITER.pid != os.getpid():
+            _ARTIFACT_WRITER = AsyncArtifactWriter()
+        return _ARTIFACT_WRITER
+
+
+def flush_artifact_writes() -> None:
+    """Pack the buffered conversation artifacts, and wait for all pending artifact writes of the process to reach the disk."""
+    commit_packed_artifacts()
+    writer = _ARTIFACT_WRITER
+    if writer is not None and writer.pid == os.getpid():
+        writer.flush()
+
+
+def _flush_at_exit() -> None:
+    """
+    Write the remaining artifacts before the interpreter kills the writer's daemon thread.
+    Threads cannot be started at interpreter shutdown, so the packed artifacts are written from this thread.
+    """
+    writer = _ARTIFACT_WRITER
+    if writer is not None and writer.pid == os.getpid():
+        writer.flush()
+    commit_packed_artifacts(synchronous=True)
+
+
+atexit.register(_flush_at_exit)
+
+
+def _pending_artifact(file_path: str) -> Optional[bytes]:
+    """Get the content of an artifact waiting to be written, if any."""
+    writer = _ARTIFACT_WRITER
+    if writer is None or writer.pid != os.getpid():
+        return None
+    return writer.pending(os.path.abspath(file_path))
+
+
+# Artifacts waiting to be packed (with PACKED_ARTIFACTS), by conversation directory then file name,
+# as msgpack-encoded values so later changes to the saved data do not leak into them
+_PACKED_BUFFERS: Dict[str, Dict[str, bytes]] = {}
+_PACKED_LOCK = threading.Lock()
+
+# Members of the packed artifacts files read so far, by conversation directory, with the stamp of the content they
+# were split from: the pending payload itself, or the (mtime, size) of the file on disk
+_PACKED_MEMBERS: Dict[str, Tuple[Any, Dict[str, bytes]]] = {}
+# Packed artifacts are read from thread pools, e.g. by the evaluation aggregator
+_PACKED_MEMBERS_LOCK = threading.Lock()
+# Maximum number of conversation directories whose packed members are kept in memory
+PACKED_CACHE_SIZE = 64
+
+
+def _split_packed(payload: bytes) -> Dict[str, bytes]:
+    """Split a packed artifacts file into the msgpack-encoded value of each artifact, without decoding the values."""
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(payload)
+    members = {}
+    for _ in range(unpacker.read_map_header()):
+        name = unpacker.unpack()
+        start = unpacker.tell()
+        unpacker.skip()
+        members[name] = payload[start:unpacker.tell()]
+    return members
+
+
+def _remember_packed(directory: str, stamp: Any, members: Dict[str, bytes]) -> None:
+    """Memoize the packed members of a conversation directory, evicting the oldest directory when full."""
+    with _PACKED_MEMBERS_LOCK:
+        _PACKED_MEMBERS.pop(directory, None)
+        if len(_PACKED_MEMBERS) >= PACKED_CACHE_SIZE:
+            _PACKED_MEMBERS.pop(next(iter(_PACKED_MEMBERS)), None)
+        _PACKED_MEMBERS[directory] = (stamp, members)
+
+
+def _load_packed(directory: str) -> Dict[str, bytes]:
+    """
+    Get the artifacts packed in a conversation directory, as msgpack-encoded values by file name.
+    The file is only split again when its content changed since the last call.
+    
+    Args:
+        directory: Absolute path of the conversation directory
+        
+    Returns:
+        The packed artifacts (not to be modified), or an empty dictionary if there are none
+    """
+    packed_path = f"{directory}{os.sep}{PACKED_ARTIFACTS_FILENAME}"
+    # The file is read and split outside the lock, a stale entry is only split again on the next call
+    with _PACKED_MEMBERS_LOCK:
+        cached = _PACKED_MEMBERS.get(directory)
+    payload = _pending_artifact(packed_path)
+    if payload is not None:
+        if cached is not None and cached[0] is payload:
+            return cached[1]
+        stamp = payload
+    else:
+        try:
+            stat = os.stat(packed_path)
+        except FileNotFoundError:
+            return {}
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            with open(packed_path, 'rb') as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return {}
+    members = _split_packed(payload)
+    _remember_packed(directory, stamp, members)
+    return members
+
+
+def _pack_artifact(file_path: str, value: Any) -> None:
+    """
+    Buffer an artifact of a conversation until its artifacts are packed.
+    
+    Args:
+        file_path: Path the artifact would have as a separate file
+        value: JSON data or text of the artifact
+    """
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    with _PACKED_LOCK:
+        buffer = _PACKED_BUFFERS.get(directory)
+        if buffer is None:
+            # The packed file is rewritten whole, so keep the artifacts it already holds
+            buffer = _PACKED_BUFFERS[directory] = dict(_load_packed(directory))
+        buffer[filename] = msgpack.packb(value)
+
+
+def commit_packed_artifacts(directory: Optional[str] = None, synchronous: bool = False) -> None:
+    """
+    Write the buffered artifacts of a conversation into its packed artifacts file, in the background.
+    
+    Args:
+        directory: Conversation directory to commit, or None to commit all buffered conversations
+        synchronous: Whether to write the files from the calling thread instead of the artifact writer, which
+            must not be started at interpreter shutdown
+    """
+    with _PACKED_LOCK:
+        if directory is None:
+            buffers = list(_PACKED_BUFFERS.items())
+            _PACKED_BUFFERS.clear()
+        else:
+            directory = os.path.abspath(directory)
+            buffer = _PACKED_BUFFERS.pop(directory, None)
+            buffers = [] if buffer is None else [(directory, buffer)]
+        # Submitted under the lock, so readers find the artifacts either buffered or pending
+        for directory, buffer in buffers:
+            packer = msgpack.Packer()
+            payload = b"".join([packer.pack_map_header(len(buffer)),
+                                *(packer.pack(name) + value for name, value in buffer.items())])
+            packed_path = f"{directory}{os.sep}{PACKED_ARTIFACTS_FILENAME}"
+            if synchronous:
+                try:
+                    _write_bytes(packed_path, payload)
+                except OSError as e:
+                    # Keep writing the other conversations
+                    print(f"Error writing {packed_path}: {e}")
+                continue
+            artifact_writer().submit(packed_path, payload)
+            # The members are already split, so reads of the pending payload skip the split
+            _remember_packed(directory, payload, buffer)
+
+
+def _packed_member(file_path: str) -> Optional[bytes]:
+    """
+    Get the msgpack-encoded value of an artifact stored in the packed artifacts of its conversation.
+    
+    Args:
+        file_path: Path the artifact would have as a separate file
+        
+    Returns:
+        The encoded value, or None if the artifact is not packed
+    """
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    with _PACKED_LOCK:
+        buffer = _PACKED_BUFFERS.get(directory)
+        if buffer is not None:
+            return buffer.get(filename)
+    return _load_packed(directory).get(filename)
+
+
+def _packed_artifact_bytes(file_path: str) -> Optional[bytes]:
+    """
+    Get an artifact stored in the packed artifacts of its conversation, encoded as its separate file would be.
+    
+    Args:
+        file_path: Path the artifact would have as a separate file
+        
+    Returns:
+        The content of the artifact, or None if it is not packed
+    """
+    member = _packed_member(file_path)
+    if member is None:
+        return None
+    value = msgpack.unpackb(member)
+    return value.encode('utf-8') if isinstance(value, str) else orjson.dumps(value, option=orjson.OPT_INDENT_2)
+
+
+def _iter_prefix(value: Any, keys: List[str]) -> Iterator[Any]:
+    """Iterate over the values at an ijson prefix of parsed JSON data, given as its list of keys."""
+    if not keys:
+        yield value
+    elif keys[0] == "item":
+        if isinstance(value, list):
+            for item in value:
+                yield from _iter_prefix(item, keys[1:])
+    elif isinstance(value, dict) and keys[0] in value:
+        yield from _iter_prefix(value[keys[0]], keys[1:])
 
 
 class ExperimentPathManager:
@@ -34,6 +432,16 @@ class ExperimentPathManager:
         self.ensure_dir_exists(self.experiment_dir)
         self._pdf_path = None
         self._conversation_name = None
+        # Directory of the current conversation, once it was looked up
+        self._current_conv_dir: Optional[str] = None
+        # Highest conversation number of the experiment, known after the first listing
+        self._max_conv_num: Optional[int] = None
+        # Counter file of the last allocated conversation number, shared by all processes
+        self._next_id_path = os.path.join(self.experiment_dir, NEXT_ID_FILENAME)
+        # Conversation directories known to exist, so they are not created again on every path lookup
+        self._ensured_dirs: set = set()
+        # Shared files loaded by this path manager, by path, with the save version they were loaded at
+        self._shared_json: Dict[str, Tuple[int, Dict[str, Any]]] = {}
 
     @property
     def pdf_path(self):
@@ -47,6 +455,7 @@ class ExperimentPathManager:
     def conversation_name(self):
         """Get the current conversation name, initialize if not set."""
         if self._conversation_name is None:
+            # Only peek at the next name, conversation numbers are allocated when the conversation is created
             self.set_next_conversation()
         return self._conversation_name
     
@@ -54,6 +463,7 @@ class ExperimentPathManager:
     def conversation_name(self, name):
         """Set the conversation name manually."""
         self._conversation_name = name
+        self._current_conv_dir = None
 
     @staticmethod
     def ensure_dir_exists(dir_path: str) -> None:
@@ -62,15 +472,56 @@ class ExperimentPathManager:
 
     def set_next_conversation(self) -> str:
         """
-        Set the conversation name to the next available one and return it.
+        Set the conversation name to the next available one and return it, without allocating its number.
         
         Returns:
             New conversation name with incremented number
         """
-        count = len(self.list_conversations()) + 1
-        self._conversation_name = f"conversation_{count}"
+        self._conversation_name = self.next_conversation_name()
+        self._current_conv_dir = None
         return self._conversation_name
 
+    def _allocate_conversation_number(self) -> int:
+        """
+        Allocate the number of a new conversation, from the counter file where file locks are available,
+        or else from the highest conversation number known to this path manager.
+        
+        Returns:
+            The allocated conversation number
+        """
+        if fcntl is not None:
+            return self._allocate_next_id()
+        if self._max_conv_num is None:
+            self.list_conversations()
+        self._max_conv_num += 1
+        return self._max_conv_num
+
+    def _allocate_next_id(self) -> int:
+        """
+        Allocate the next conversation number from the counter file of the experiment, without listing it.
+        The file is locked while it is updated, so concurrent processes never get the same number.
+        Experiments created before the counter existed are seeded from their highest conversation number.
+        
+        Returns:
+            The allocated conversation number
+        """
+        fd = os.open(self._next_id_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            content = os.read(fd, 32).strip()
+            if content:
+                number = int(content) + 1
+            else:
+                self.list_conversations()
+                number = self._max_conv_num + 1
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(number).encode())
+            return number
+        finally:
+            # Closing the file releases the lock
+            os.close(fd)
+
     def set_conversation(self, conversation_name: str) -> str:
         """
         Set the conversation name explicitly.
@@ -82,50 +533,84 @@ class ExperimentPathManager:
             The set conversation name
         """
         self._conversation_name = conversation_name
+        self._current_conv_dir = None
         return self._conversation_name
 
     def next_conversation_name(self) -> str:
         """
-        Generate the next conversation name based on the number of existing conversations.
+        Generate the next conversation name based on the conversation counter, or else on the highest
+        existing conversation number.
         Assumes conversations are created sequentially.
         
         Returns:
             New conversation name with incremented number
         """
-        count = len(self.list_conversations()) + 1
-        return f"conversation_{count}"
+        if fcntl is not None:
+            try:
+                with open(self._next_id_path, 'rb') as f:
+                    content = f.read().strip()
+            except FileNotFoundError:
+                content = b""
+            if content:
+                return f"conversation_{int(content) + 1}"
+        if self._max_conv_num is None:
+            self.list_conversations()
+        return f"conversation_{self._max_conv_num + 1}"
 
     def list_conversations(self) -> List[str]:
         """
-        List all conversations in this experiment.
+        List all conversations in this experiment, in directory order, and record the highest conversation number.
         
         Returns:
             List of conversation names
         """
-        if not os.path.exists(self.experiment_dir) or not os.listdir(self.experiment_dir):
+        # Opening the directory is the only check needed: a missing directory has no conversations
+        try:
+            entries = os.scandir(self.experiment_dir)
+        except FileNotFoundError:
+            self._max_conv_num = 0
             return []
 
-        # Get directory listing and filter for conversation folders
-        pattern = r"^conversation_\d+$"
-        conversations = [
-            item for item in os.listdir(self.experiment_dir)
-            if re.match(pattern, item)
-        ]
-
-        # Sort by conversation number
-        conversations.sort()
+        # Scan the directory for conversation folders in a single pass; scandir entries know their type
+        # without extra stat calls
+        conversations = []
+        max_conv_num = 0
+        with entries:
+            for entry in entries:
+                match = _CONV_RE.match(entry.name)
+                if match and entry.is_dir(follow_symlinks=False):
+                    conversations.append(entry.name)
+                    number = int(match.group(1))
+                    if number > max_conv_num:
+                        max_conv_num = number
+        self._max_conv_num = max_conv_num
         return conversations
 
+    def list_conversations_sorted(self) -> List[str]:
+        """
+        List all conversations in this experiment, sorted by conversation number.
+        
+        Returns:
+            List of conversation names
+        """
+        return sorted(self.list_conversations(), key=lambda name: int(name.rpartition("_")[2]))
+
     def get_conversation_dir(self) -> str:
         """
         Get the directory path for the current conversation within this experiment.
         Creates the directory if it doesn't exist.
+        The path is cached until the current conversation changes, as every artifact path is built from it.
         
         Returns:
             Path to the conversation directory
         """
+        if self._current_conv_dir is not None:
+            return self._current_conv_dir
         conversation_dir = os.path.join(self.experiment_dir, self.conversation_name)
-        self.ensure_dir_exists(conversation_dir)
+        if conversation_dir not in self._ensured_dirs:
+            self.ensure_dir_exists(conversation_dir)
+            self._ensured_dirs.add(conversation_dir)
+        self._current_conv_dir = conversation_dir
         return conversation_dir
 
     def get_ground_truth_path(self) -> str:
@@ -135,7 +620,7 @@ class ExperimentPathManager:
         Returns:
             Path to the ground truth file
         """
-        return os.path.join(self.get_conversation_dir(), "ground_truth.json")
+        return f"{self.get_conversation_dir()}{os.sep}ground_truth.json"
 
     def get_generated_conversation_path(self) -> str:
         """
@@ -144,7 +629,7 @@ class ExperimentPathManager:
         Returns:
             Path to the generated conversation file
         """
-        return os.path.join(self.get_conversation_dir(), "generated_conversation.txt")
+        return f"{self.get_conversation_dir()}{os.sep}generated_conversation.txt"
 
     def get_extracted_data_path(self) -> str:
         """
@@ -153,7 +638,7 @@ class ExperimentPathManager:
         Returns:
             Path to the extracted data file
         """
-        return os.path.join(self.get_conversation_dir(), "extracted.json")
+        return f"{self.get_conversation_dir()}{os.sep}extracted.json"
 
     def get_evaluation_path(self) -> str:
         """
@@ -162,7 +647,7 @@ class ExperimentPathManager:
         Returns:
             Path to the evaluation file
         """
-        return os.path.join(self.get_conversation_dir(), "evaluation.json")
+        return f"{self.get_conversation_dir()}{os.sep}evaluation.json"
 
     # File saving methods
 
@@ -176,7 +661,7 @@ class ExperimentPathManager:
         Returns:
             Path to the saved ground truth file
         """
-        return self.save_json(ground_truth_data, self.get_ground_truth_path())
+        return self.save_artifact_json(ground_truth_data, self.get_ground_truth_path(), safe=False)
 
     def save_conversation(self, conversation_text: str) -> str:
         """
@@ -188,7 +673,7 @@ class ExperimentPathManager:
         Returns:
             Path to the saved conversation file
         """
-        return self.save_text(conversation_text, self.get_generated_conversation_path())
+        return self.save_artifact_text(conversation_text, self.get_generated_conversation_path(), safe=False)
 
     def save_extracted_data(self, extracted_data: Dict[str, Any]) -> str:
         """
@@ -200,7 +685,7 @@ class ExperimentPathManager:
         Returns:
             Path to the saved extracted data file
         """
-        return self.save_json(extracted_data, self.get_extracted_data_path())
+        return self.save_artifact_json(extracted_data, self.get_extracted_data_path(), safe=False)
 
     def save_evaluation(self, evaluation_data: Dict[str, Any]) -> str:
         """
@@ -212,50 +697,181 @@ class ExperimentPathManager:
         Returns:
             Path to the saved evaluation file
         """
-        return self.save_json(evaluation_data, self.get_evaluation_path())
+        return self.save_artifact_json(evaluation_data, self.get_evaluation_path(), safe=False)
 
     # General file operation methods
+    # With safe=False, the parent directory must already exist, which saves a mkdir call per write
 
     @staticmethod
-    def save_json(data: Dict[str, Any], file_path: str) -> str:
+    def save_json(data: Dict[str, Any], file_path: str, safe: bool = True) -> str:
         """
         Save data as JSON to a file.
         
         Args:
             data: Data to save
             file_path: Path to save the file
+            safe: Whether to create the parent directory if needed
         Returns:
             Path to the saved file
         """
         # Ensure parent directory exists
-        ExperimentPathManager.ensure_dir_exists(os.path.dirname(file_path))
+        if safe:
+            ExperimentPathManager.ensure_dir_exists(os.path.dirname(file_path))
 
-        # Write the JSON data
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+        # Write the JSON data, encoded in a single call
+        _write_bytes(file_path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
         return file_path
 
-    def save_text(self, text: str, file_path: str) -> str:
+    def save_text(self, text: str, file_path: str, safe: bool = True) -> str:
         """
         Save text to a file.
         
         Args:
             text: Text to save
             file_path: Path to save the file
+            safe: Whether to create the parent directory if needed
             
         Returns:
             Path to the saved file
         """
         # Ensure parent directory exists
-        self.ensure_dir_exists(os.path.dirname(file_path))
+        if safe:
+            self.ensure_dir_exists(os.path.dirname(file_path))
 
         # Write the text
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        _write_bytes(file_path, text.encode('utf-8'))
 
         return file_path
 
+    @staticmethod
+    def save_artifact_json(data: Dict[str, Any], file_path: str, safe: bool = True) -> str:
+        """
+        Save data as JSON to a file in the background, through the artifact writer.
+        The data is serialized right away, so it may be modified once this returns.
+        
+        Args:
+            data: Data to save
+            file_path: Path to save the file
+            safe: Whether to create the parent directory if needed
+            
+        Returns:
+            Path to the saved file
+        """
+        if safe:
+            ExperimentPathManager.ensure_dir_exists(os.path.dirname(file_path))
+        if settings.PACKED_ARTIFACTS:
+            _pack_artifact(file_path, data)
+            return file_path
+        artifact_writer().submit(os.path.abspath(file_path), orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return file_path
+
+    @staticmethod
+    def save_artifact_text(text: str, file_path: str, safe: bool = True) -> str:
+        """
+        Save text to a file in the background, through the artifact writer.
+        
+        Args:
+            text: Text to save
+            file_path: Path to save the file
+            safe: Whether to create the parent directory if needed
+            
+        Returns:
+            Path to the saved file
+        """
+        if safe:
+            ExperimentPathManager.ensure_dir_exists(os.path.dirname(file_path))
+        if settings.PACKED_ARTIFACTS:
+            _pack_artifact(file_path, text)
+            return file_path
+        artifact_writer().submit(os.path.abspath(file_path), text.encode('utf-8'))
+        return file_path
+
+    @staticmethod
+    def flush_writes() -> None:
+        """Wait for the artifacts saved in the background to reach the disk, packing the buffered ones first."""
+        flush_artifact_writes()
+
+    def commit_conversation(self) -> None:
+        """Pack the buffered artifacts of the current conversation (with PACKED_ARTIFACTS) into a single file."""
+        commit_packed_artifacts(self.get_conversation_dir())
+
+    @staticmethod
+    def artifact_mtime_ns(file_path: str) -> int:
+        """
+        Get the modification time of an artifact, or of the packed artifacts file that holds it.
+        
+        Args:
+            file_path: Path to the artifact
+            
+        Returns:
+            Modification time in nanoseconds
+            
+        Raises:
+            FileNotFoundError: If neither file exists
+        """
+        try:
+            return os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            return os.stat(os.path.join(os.path.dirname(file_path), PACKED_ARTIFACTS_FILENAME)).st_mtime_ns
+
+    @staticmethod
+    def iter_json_key(file_path: str, prefix: str) -> Iterator[Any]:
+        """
+        Iterate over the values at a prefix of a JSON file, without loading the whole file when ijson is available.
+        The parsing is incremental, so it stops as soon as the caller stops iterating; use `load_json` for small
+        files read whole.
+        
+        Args:
+            file_path: Path to the JSON file
+            prefix: ijson prefix of the values: dot-separated keys, with "item" for array elements
+                (e.g. "metrics", or "item.metrics" in an array of objects)
+            
+        Returns:
+            Iterator over the values, with non-integer numbers as floats
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        payload = _pending_artifact(file_path)
+        if payload is None and not os.path.exists(file_path):
+            member = _packed_member(file_path)
+            if member is not None:
+                # Packed artifacts are decoded whole, there is nothing to stream
+                yield from _iter_prefix(msgpack.unpackb(member), prefix.split(".") if prefix else [])
+                return
+        with io.BytesIO(payload) if payload is not None else open(file_path, 'rb') as f:
+            if ijson is None:
+                yield from _iter_prefix(orjson.loads(f.read()), prefix.split(".") if prefix else [])
+            else:
+                yield from ijson.items(f, prefix, use_float=True)
+
+    @staticmethod
+    def load_bytes(file_path: str) -> bytes:
+        """
+        Load the raw content of a file, including artifacts not written yet.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            The content of the file
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        payload = _pending_artifact(file_path)
+        if payload is not None:
+            return payload
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            payload = _packed_artifact_bytes(file_path)
+            if payload is None:
+                raise
+            return payload
+
     @staticmethod
     def load_json(file_path: str) -> Dict[str, Any]:
         """
@@ -269,10 +885,19 @@ class ExperimentPathManager:
             
         Raises:
             FileNotFoundError: If the file doesn't exist
-            json.JSONDecodeError: If the file contains invalid JSON
+            orjson.JSONDecodeError: If the file contains invalid JSON (a subclass of json.JSONDecodeError)
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        payload = _pending_artifact(file_path)
+        if payload is None:
+            try:
+                with open(file_path, 'rb') as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                member = _packed_member(file_path)
+                if member is None:
+                    raise
+                return msgpack.unpackb(member)
+        return orjson.loads(payload)
 
     @staticmethod
     def load_text(file_path: str) -> str:
@@ -288,8 +913,17 @@ class ExperimentPathManager:
         Raises:
             FileNotFoundError: If the file doesn't exist
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        payload = _pending_artifact(file_path)
+        if payload is not None:
+            return payload.decode('utf-8')
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            payload = _packed_artifact_bytes(file_path)
+            if payload is None:
+                raise
+            return payload.decode('utf-8')
 
     @staticmethod
     def file_exists(file_path: str) -> bool:
@@ -302,7 +936,8 @@ class ExperimentPathManager:
         Returns:
             True if the file exists, False otherwise
         """
-        return os.path.isfile(file_path)
+        return (os.path.isfile(file_path) or _pending_artifact(file_path) is not None
+                or _packed_member(file_path) is not None)
 
     @staticmethod
     def create_backup(file_path: str) -> str:
@@ -318,6 +953,7 @@ class ExperimentPathManager:
         Raises:
             FileNotFoundError: If the file doesn't exist
         """
+        flush_artifact_writes()
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
@@ -327,7 +963,7 @@ class ExperimentPathManager:
         backup_path = f"{filename}_backup_{timestamp}{ext}"
 
         # Copy the file
-        shutil.copy2(file_path, backup_path)
+        _clone_file(file_path, backup_path)
 
         return backup_path
 
@@ -341,9 +977,17 @@ class ExperimentPathManager:
         Returns:
             True if the conversation exists, False otherwise
         """
+        # Known conversations skip the stat call; others are checked on disk, as other processes may have created them
+        if conversation_name in self._conversation_set:
+            return True
         conversation_dir = os.path.join(self.experiment_dir, conversation_name)
         return os.path.isdir(conversation_dir)
 
+    @cached_property
+    def _conversation_set(self) -> set:
+        """Names of the conversations of the experiment, listed on first use."""
+        return set(self.list_conversations())
+
     def has_ground_truth(self) -> bool:
         """
         Check if ground truth exists for the current conversation.
@@ -374,17 +1018,26 @@ class ExperimentPathManager:
     def create_conversation(self) -> str:
         """
         Create a new conversation directory and set it as the current conversation.
+        The directory is claimed with an exclusive mkdir, so concurrent pipeline processes never share one.
         
         Returns:
             Path to the created conversation directory
         """
-        # Generate name
-        self.set_next_conversation()
-
-        # Create the directory
-        conversation_dir = self.get_conversation_dir()
-        
-        return conversation_dir
+        while True:
+            # Generate name
+            self._conversation_name = f"conversation_{self._allocate_conversation_number()}"
+
+            # Create the directory
+            conversation_dir = os.path.join(self.experiment_dir, self._conversation_name)
+            try:
+                os.mkdir(conversation_dir)
+                self._ensured_dirs.add(conversation_dir)
+                self._current_conv_dir = conversation_dir
+                self.__dict__.pop('_conversation_set', None)
+                return conversation_dir
+            except FileExistsError:
+                # Another process claimed it, list the conversations again to skip past its conversations
+                self._max_conv_num = None
 
     def delete_conversation(self, backup: bool = True) -> bool:
         """
@@ -398,18 +1051,24 @@ class ExperimentPathManager:
         """
         conversation_dir = os.path.join(self.experiment_dir, self.conversation_name)
 
-        # Check if the conversation exists
+        # Check if the conversation exists, with all its files written
+        flush_artifact_writes()
         if not os.path.isdir(conversation_dir):
             return False
 
-        # Create backup if requested
+        # Keep the directory as the backup if requested, as renaming it needs no copy, or else delete it
         if backup:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_dir = f"{conversation_dir}_backup_{timestamp}"
-            shutil.copytree(conversation_dir, backup_dir)
+            os.rename(conversation_dir, backup_dir)
+        else:
+            shutil.rmtree(conversation_dir)
 
-        # Delete the conversation directory
-        shutil.rmtree(conversation_dir)
+        # Forget the highest conversation number as it may be this one
+        self._max_conv_num = None
+        self._ensured_dirs.discard(conversation_dir)
+        self._current_conv_dir = None
+        self.__dict__.pop('_conversation_set', None)
 
         return True
 
@@ -417,35 +1076,106 @@ class ExperimentPathManager:
     # Function to get the global template path
     def template_path(self) -> str:
         """Get the path for the global template file in results."""
-        return str(os.path.join(RESULTS_DIR, TEMPLATE_FILENAME))
+        return TEMPLATE_PATH
 
     @property
     def abridged_template_path(self) -> str:
         """Get the path for the global template file in results."""
-        return str(os.path.join(RESULTS_DIR, TEMPLATE_FILENAME_ABR))
+        return TEMPLATE_ABR_PATH
 
     @property
     def schema_path(self) -> str:
         """Get the path for the global schema file in results."""
-        return str(os.path.join(RESULTS_DIR, SCHEMA_FILENAME))
+        return SCHEMA_PATH
+
+    def cache_root(self) -> str:
+        """Get the root directory of the LLM response cache, shared by all experiments."""
+        return LLM_CACHE_ROOT
+
+    @staticmethod
+    def load_cached_json(file_path: str) -> Dict[str, Any]:
+        """
+        Load JSON data from a file, parsing it again only if the file changed since it was last loaded.
+        The returned data is shared between callers and must not be modified.
+        
+        Args:
+            file_path: Path to the JSON file
+            
+        Returns:
+            The loaded JSON data
+        """
+        key = os.path.abspath(file_path)
+        mtime_ns = os.stat(key).st_mtime_ns
+        cached = _JSON_CACHE.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        data = ExperimentPathManager.load_json(key)
+        _JSON_CACHE[key] = (mtime_ns, data)
+        return data
+
+    @staticmethod
+    def save_shared_json(data: Dict[str, Any], file_path: str) -> str:
+        """Save JSON data to a file loaded through `load_cached_json`, evicting its cached data."""
+        global _SHARED_JSON_VERSION
+        _JSON_CACHE.pop(os.path.abspath(file_path), None)
+        _SHARED_JSON_VERSION += 1
+        return ExperimentPathManager.save_json(data, file_path)
+
+    def _load_shared_json(self, file_path: str) -> Dict[str, Any]:
+        """
+        Load a shared file through `load_cached_json`, memoized on the path manager to skip even the stat call.
+        Saves of this process invalidate the memo, but changes made by other processes are only seen by new
+        path managers, as templates and schemas do not change during a pipeline run.
+        The returned data is shared between callers and must not be modified.
+        
+        Args:
+            file_path: Path to the JSON file
+            
+        Returns:
+            The loaded JSON data
+        """
+        memo = self._shared_json.get(file_path)
+        if memo is not None and memo[0] == _SHARED_JSON_VERSION:
+            return memo[1]
+        data = ExperimentPathManager.load_cached_json(file_path)
+        self._shared_json[file_path] = (_SHARED_JSON_VERSION, data)
+        return data
 
     def save_template(self, template_data: Dict[str, Any]) -> str:
-        return ExperimentPathManager.save_json(template_data, self.template_path)
+        return ExperimentPathManager.save_shared_json(template_data, self.template_path)
 
     def save_abridged_template(self, template_data: Dict[str, Any]) -> str:
-        return ExperimentPathManager.save_json(template_data, self.abridged_template_path)
+        return ExperimentPathManager.save_shared_json(template_data, self.abridged_template_path)
 
     def load_template(self) -> Dict[str, Any]:
-        return ExperimentPathManager.load_json(self.template_path)
+        return self._load_shared_json(self.template_path)
 
     def load_abridged_template(self) -> Dict[str, Any]:
-        return ExperimentPathManager.load_json(self.abridged_template_path)
+        return self._load_shared_json(self.abridged_template_path)
 
     def save_schema(self, schema_data: Dict[str, Any]) -> str:
-        return ExperimentPathManager.save_json(schema_data, self.schema_path)
+        return ExperimentPathManager.save_shared_json(schema_data, self.schema_path)
 
     def load_schema(self) -> Dict[str, Any]:
-        return ExperimentPathManager.load_json(self.schema_path)
+        return self._load_shared_json(self.schema_path)
+
+    def get_compiled_validator(self) -> Callable[[Any], Any]:
+        """
+        Get the validator of the schema, compiled once and shared by all path managers of the process.
+        It is compiled again when the schema is saved or changes on disk, as that loads a new schema object.
+        
+        Returns:
+            Function validating data against the schema
+            (raises fastjsonschema.JsonSchemaException if the data is invalid)
+        """
+        schema = self.load_schema()
+        cached = _VALIDATORS.get(self.schema_path)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        # The schema file wraps the JSON schema in the structured output format of the Responses API
+        validator = fastjsonschema.compile(schema["format"]["schema"])
+        _VALIDATORS[self.schema_path] = (schema, validator)
+        return validator
 
 
 # Function to get an experiment path manager
@@ -470,11 +1200,12 @@ def list_experiments() -> List[str]:
     Returns:
         List of experiment names
     """
-    if not os.path.exists(RESULTS_DIR):
+    # Get directories that aren't __pycache__ or hidden (e.g. the LLM cache)
+    try:
+        with os.scandir(RESULTS_DIR) as entries:
+            return [
+                entry.name for entry in entries
+                if entry.name != "__pycache__" and not entry.name.startswith(".") and entry.is_dir()
+            ]
+    except FileNotFoundError:
         return []
-
-    # Get directories that aren't __pycache__
-    return [
-        d for d in os.listdir(RESULTS_DIR)
-        if os.path.isdir(os.path.join(RESULTS_DIR, d)) and d != "__pycache__"
-    ]
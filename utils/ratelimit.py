@@ -0,0 +1,161 @@
+"""
+Client-side rate limiting for LLM API calls.
+Keeps requests within a request-per-minute and token-per-minute budget, so that bursts of concurrent calls
+are spread out instead of being rejected with 429s.
+"""
+
+import asyncio
+import functools
+import json
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from utils import settings
+
+# Durations in x-ratelimit-reset-* headers look like "1s", "6m0s" or "20ms"
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+class RateLimiter:
+    """
+    Request and token budget shared by all API calls of the process.
+    Requests are spaced evenly over the minute, and tokens are drawn from a bucket that refills continuously.
+    Both budgets are tightened from the x-ratelimit-* headers returned by the API.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Maximum number of requests per minute
+            tokens_per_minute: Maximum number of tokens per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._next_request_ts = 0.0
+        self._tokens_remaining = float(tokens_per_minute)
+        self._last_refill_ts = time.monotonic()
+
+    def set_limits(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        """
+        Change the budgets, e.g. to split them between processes sharing the same API key.
+
+        Args:
+            requests_per_minute: Maximum number of requests per minute
+            tokens_per_minute: Maximum number of tokens per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._tokens_remaining = min(self._tokens_remaining, float(tokens_per_minute))
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill, up to the per-minute budget."""
+        elapsed = now - self._last_refill_ts
+        self._tokens_remaining = min(
+            float(self.tokens_per_minute),
+            self._tokens_remaining + elapsed * self.tokens_per_minute / 60
+        )
+        self._last_refill_ts = now
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Reserve capacity for a request.
+
+        Args:
+            tokens: Estimated number of tokens of the request
+
+        Returns:
+            Number of seconds to wait before sending the request
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        request_ts = max(now, self._next_request_ts)
+        self._next_request_ts = request_ts + 60 / self.requests_per_minute
+
+        self._tokens_remaining -= tokens
+        token_wait = -self._tokens_remaining * 60 / self.tokens_per_minute if self._tokens_remaining < 0 else 0.0
+
+        return max(request_ts - now, token_wait)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until both budgets allow a request of the given size."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def refund(self, tokens: int) -> None:
+        """
+        Give back the tokens reserved for a request that the API rejected without processing it.
+
+        Args:
+            tokens: Estimated number of tokens of the request
+        """
+        self._tokens_remaining = min(float(self.tokens_per_minute), self._tokens_remaining + tokens)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Tighten the budgets from the rate limit headers of an API response.
+
+        Args:
+            headers: Response headers
+        """
+        now = time.monotonic()
+
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            self._refill(now)
+            self._tokens_remaining = min(self._tokens_remaining, float(remaining_tokens))
+
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests is not None and int(remaining_requests) == 0:
+            reset = _parse_duration(headers.get("x-ratelimit-reset-requests"))
+            if reset is not None:
+                self._next_request_ts = max(self._next_request_ts, now + reset)
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a duration such as "6m0s" into seconds."""
+    if not value:
+        return None
+    matches = _DURATION_RE.findall(value)
+    if not matches:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in matches)
+
+
+def estimate_tokens(request: Dict[str, Any]) -> int:
+    """Roughly estimate the input tokens of a request, at ~4 characters per token."""
+    return len(json.dumps(request.get("input", ""))) // 4 + 1
+
+
+# Shared by all generators of the process
+rate_limiter = RateLimiter(settings.RATE_LIMIT_RPM, settings.RATE_LIMIT_TPM)
+
+
+def ratelimited(create: Callable[..., Awaitable[Any]], limiter: RateLimiter = rate_limiter):
+    """
+    Wrap an async API call so it waits for rate limit capacity before being sent.
+    If the call returns an object with `headers` (e.g. a `with_raw_response` method), the limits are updated
+    from them.
+
+    Args:
+        create: Async function taking the request as keyword arguments
+        limiter: Rate limiter to draw from
+
+    Returns:
+        The wrapped function
+    """
+    @functools.wraps(create)
+    async def wrapper(**request):
+        await limiter.acquire(estimate_tokens(request))
+        response = await create(**request)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            limiter.update_from_headers(headers)
+        return response
+
+    return wrapper
@@ -0,0 +1,21 @@
+"""
+Retry policy for LLM API calls.
+Transient failures (rate limits, dropped connections, timeouts) are retried with randomized exponential backoff
+instead of aborting the pipeline.
+"""
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+from utils import settings
+
+# The SDK's own retries are disabled, so server errors are retried here as well
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+# Decorator for sync or async functions issuing API calls
+retry_api_call = retry(
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(settings.MAX_RETRIES + 1),
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    reraise=True,
+)
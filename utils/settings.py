@@ -13,10 +13,41 @@ load_dotenv()
 # I put this here to show how we can load and use API keys for other clients too (openai loads it automatically)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Model settings (set CONVERSATION_MODEL=gpt-4.5-preview to compare against the original generation model)
+CONVERSATION_MODEL = os.getenv("CONVERSATION_MODEL", "gpt-4o")
+EXTRACTION_MODEL = os.getenv("EXTRACTION_MODEL", "gpt-4o-mini")
+
 # Processing settings
-MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", 5))
 TEMPERATURE = float(os.getenv("TEMPERATURE", 0.7))
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", 4096))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 8))
+
+# Client-side rate limits, corrected at runtime from the x-ratelimit-* response headers
+RATE_LIMIT_RPM = int(os.getenv("RATE_LIMIT_RPM", 500))
+RATE_LIMIT_TPM = int(os.getenv("RATE_LIMIT_TPM", 200000))
+
+# Post requests with aiohttp instead of the OpenAI SDK, for high-concurrency bulk runs
+USE_RAW_TRANSPORT = os.getenv("USE_RAW_TRANSPORT", "false").lower() in ("1", "true", "yes")
+
+# Store the artifacts of each conversation in a single msgpack file instead of one JSON/text file each
+PACKED_ARTIFACTS = os.getenv("PACKED_ARTIFACTS", "false").lower() in ("1", "true", "yes")
+
+# LLM response cache settings (disable in production to always hit the API)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Evaluation settings: value pairs less similar than this (rapidfuzz ratio, 0-100) skip the LLM semantic match
+SEMANTIC_MATCH_MIN_RATIO = float(os.getenv("SEMANTIC_MATCH_MIN_RATIO", 40))
+# Maximum number of value pairs judged in a single semantic match request
+SEMANTIC_MATCH_BATCH_SIZE = int(os.getenv("SEMANTIC_MATCH_BATCH_SIZE", 50))
+
+# Batch API settings
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", 30))
+
+# Prompt settings
+MAX_MISSING_FIELDS_IN_PROMPT = int(os.getenv("MAX_MISSING_FIELDS_IN_PROMPT", 100))
+# Indent the JSON embedded in prompts and log prompt token counts (costs extra input tokens)
+DEBUG_PROMPTS = os.getenv("DEBUG_PROMPTS", "false").lower() in ("1", "true", "yes")
 
 # Template generation settings
 TEMPLATE_EXTRACTION_TEMPERATURE = float(os.getenv("TEMPLATE_EXTRACTION_TEMPERATURE", 0.2))